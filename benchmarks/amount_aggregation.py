@@ -0,0 +1,101 @@
+"""Float amounts vs integer cents: aggregation speed and exactness.
+
+Loads N synthetic transactions (default 1,000,000) into a scratch database
+with both the legacy float ``amount`` and integer ``amount_cents`` and times
+the summary-style $group and an indexed amount range count on each field.
+Without a reachable MongoDB only the in-process exactness comparison runs.
+
+Usage: python benchmarks/amount_aggregation.py [--rows N] [--uri mongodb://...]
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import time
+from decimal import Decimal
+
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import PyMongoError
+
+DB_NAME = 'budgetflow_bench'
+BATCH = 10_000
+
+
+def synthetic_cents(rows: int) -> list[int]:
+    rnd = random.Random(42)
+    return [rnd.randint(1, 500_000) for _ in range(rows)]  # 0.01 .. 5000.00
+
+
+def timed(fn, repeat: int = 3) -> tuple[float, object]:
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def exactness(cents: list[int]) -> None:
+    exact = sum(Decimal(c) / 100 for c in cents)
+    float_sum = sum(c / 100 for c in cents)
+    t_float, _ = timed(lambda: sum(c / 100 for c in cents))
+    t_int, int_sum = timed(lambda: sum(cents))
+    print(f'exact total:          {exact}')
+    print(f'float sum:            {float_sum!r}  (error {Decimal(float_sum) - exact:.2E})')
+    print(f'integer cents sum:    {Decimal(int_sum) / 100}')
+    print(f'python sum float/int: {t_float * 1000:.1f} ms / {t_int * 1000:.1f} ms')
+
+
+def mongo(uri: str, cents: list[int]) -> None:
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    client.admin.command('ping')
+    coll = client[DB_NAME]['bench_amounts']
+    coll.drop()
+    print(f'loading {len(cents):,} rows ...')
+    for i in range(0, len(cents), BATCH):
+        coll.insert_many(
+            [
+                {'user_id': j % 100, 'type': 'expense', 'amount': c / 100, 'amount_cents': c}
+                for j, c in enumerate(cents[i:i + BATCH], i)
+            ],
+            ordered=False,
+        )
+    coll.create_index([('user_id', ASCENDING), ('amount', ASCENDING)])
+    coll.create_index([('user_id', ASCENDING), ('amount_cents', ASCENDING)])
+
+    def group(field):
+        pipeline = [{'$group': {'_id': '$type', 'total': {'$sum': f'${field}'}}}]
+        return list(coll.aggregate(pipeline))[0]['total']
+
+    t_float, float_total = timed(lambda: group('amount'))
+    t_int, int_total = timed(lambda: group('amount_cents'))
+    print(f'$sum amount (float):        {t_float * 1000:8.1f} ms -> {float_total!r}')
+    print(f'$sum amount_cents (int):    {t_int * 1000:8.1f} ms -> {Decimal(int_total) / 100}')
+
+    user = {'user_id': 7}
+    t_float, n_float = timed(lambda: coll.count_documents(
+        {**user, 'amount': {'$gte': 10.0, '$lte': 500.0}}))
+    t_int, n_int = timed(lambda: coll.count_documents(
+        {**user, 'amount_cents': {'$gte': 1000, '$lte': 50000}}))
+    print(f'range count amount:         {t_float * 1000:8.1f} ms ({n_float} rows)')
+    print(f'range count amount_cents:   {t_int * 1000:8.1f} ms ({n_int} rows)')
+    client.drop_database(DB_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument(
+        '--uri', default=os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')
+    )
+    args = parser.parse_args()
+    cents = synthetic_cents(args.rows)
+    exactness(cents)
+    try:
+        mongo(args.uri, cents)
+    except PyMongoError as exc:
+        print(f'MongoDB not reachable ({exc.__class__.__name__}); skipped server timings')
+
+
+if __name__ == '__main__':
+    main()
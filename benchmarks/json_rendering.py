@@ -0,0 +1,82 @@
+"""Render time of DRF's stock JSONRenderer vs core.renderers.FastJSONRenderer.
+
+Payloads are transaction list pages as the API builds them (100 rows) and a
+10k-row export-sized list, each once as API dicts (strings) and once with
+native Decimal/datetime/ObjectId values. No database needed.
+
+Usage: python benchmarks/json_rendering.py [--repeat N]
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core import renderers  # noqa: E402
+from core.renderers import FastJSONRenderer, JSONEncoder  # noqa: E402
+from transaction.services import TransactionService  # noqa: E402
+
+
+class StockRenderer(JSONRenderer):
+    encoder_class = JSONEncoder  # stock renderer + ObjectId, for native rows
+
+
+def make_rows(n: int) -> list[dict]:
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            '_id': ObjectId(),
+            'type': 'expense' if i % 3 else 'income',
+            'amount': Decimal(i * 137) / 100,
+            'amount_cents': i * 137,
+            'category': f'cat{i % 12}',
+            'description': f'merchant #{i}',
+            'created_at': base - timedelta(minutes=i),
+        }
+        for i in range(n)
+    ]
+
+
+def seconds(renderer, data, repeat: int) -> float:
+    renderer.render(data)  # warm up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        renderer.render(data)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    if renderers.orjson is None:
+        print('orjson not installed: FastJSONRenderer uses the stdlib fallback')
+    for n in (100, 10_000):
+        native = make_rows(n)
+        api = {'items': [TransactionService.to_api_dict(r) for r in native]}
+        repeat = max(1, args.repeat * 100 // n)
+        for label, data in (('api dicts', api), ('native values', {'items': native})):
+            slow = seconds(StockRenderer(), data, repeat)
+            fast = seconds(FastJSONRenderer(), data, repeat)
+            print(
+                f'{n:>6} rows, {label:<13} stock {slow * 1e3:8.2f} ms'
+                f'  fast {fast * 1e3:8.2f} ms  speedup {slow / fast:5.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Rows/second for rendering 100-row transaction pages.
+
+Compares the original read path (MongoEngine Document hydration followed by
+TransactionSerializer) with the raw-dict fast path in TransactionService.
+Both start from the same SON documents pymongo would return, so the numbers
+isolate the Python-side cost and need no running MongoDB.
+
+Usage: python benchmarks/transaction_reads.py [--pages N]
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bson import ObjectId, SON
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from transaction.models import Transaction  # noqa: E402
+from transaction.serializers import TransactionSerializer  # noqa: E402
+from transaction.services import TransactionService  # noqa: E402
+
+PAGE = 100
+
+
+def make_page() -> list[SON]:
+    base = datetime(2025, 1, 1)
+    return [
+        SON({
+            '_id': ObjectId(),
+            'user_id': 1,
+            'type': 'expense' if i % 3 else 'income',
+            'amount': round(i * 1.37, 2),
+            'category': f'cat{i % 12}',
+            'description': f'merchant #{i}',
+            'created_at': base - timedelta(minutes=i),
+        })
+        for i in range(PAGE)
+    ]
+
+
+def before(page):
+    docs = [Transaction._from_son(d) for d in page]  # pylint: disable=protected-access
+    return TransactionSerializer(docs, many=True).data
+
+
+def after(page):
+    return [TransactionService.to_api_dict(d) for d in page]
+
+
+def rows_per_second(fn, page, pages: int) -> float:
+    fn(page)  # warm up
+    t0 = time.perf_counter()
+    for _ in range(pages):
+        fn(page)
+    return pages * PAGE / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    args = parser.parse_args()
+    page = make_page()
+    assert before(page) == after(page)
+    slow = rows_per_second(before, page, args.pages)
+    fast = rows_per_second(after, page, args.pages)
+    print(f'document + serializer: {slow:>12,.0f} rows/s')
+    print(f'raw dict fast path:    {fast:>12,.0f} rows/s')
+    print(f'speedup:               {fast / slow:>12.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,3 +17,16 @@ if os.path.exists('.env'):
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from transaction import ai_client  # noqa: E402
+
+# One long-lived loop: AI calls share a pooled client (see ai_client)
+ai_client.use_shared_clients()
+
+if settings.DEBUG:
+    # uvicorn serves no static files (runserver does): keep the admin and
+    # browsable API assets working in development
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
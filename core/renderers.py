@@ -0,0 +1,86 @@
+"""Fast JSON renderer/parser for DRF.
+
+Uses orjson when it is installed and falls back to DRF's stdlib-based classes
+otherwise (or when the client asks for indented output), in the same spirit as
+the ratelimit shim. Decimal, datetime/date and ObjectId are handled in both
+paths; Decimal renders as a number, like DRF's own encoder.
+"""
+from __future__ import annotations
+import decimal
+import json
+
+from bson import ObjectId
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+
+try:  # pragma: no cover - trivial import path
+    import orjson
+except Exception:  # broad: any ImportError or unexpected issue
+    orjson = None
+
+# orjson already writes datetimes natively (RFC 3339, ``Z`` for UTC)
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    """Types orjson does not serialize itself."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    # lazy strings, UUIDs, timedeltas, querysets, ... as DRF does
+    return _fallback_encoder.default(obj)
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """Stdlib fallback: DRF's encoder plus ObjectId."""
+
+    def default(self, obj):
+        if isinstance(obj, ObjectId):
+            return str(obj)
+        return super().default(obj)
+
+
+def dumps(data) -> bytes:
+    """Compact JSON bytes, for callers outside the renderer (exports etc.)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    return JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode(data).encode()
+
+
+def loads(data: bytes | str):
+    """Counterpart of ``dumps`` for payloads read back outside the parser."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        # Same JS-safe escaping of U+2028/U+2029 as the stdlib renderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
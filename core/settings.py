@@ -117,11 +117,27 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
+    # orjson-backed JSON with a stdlib fallback; see core/renderers.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Upper bound for ?count=estimated on the transaction list; beyond this the
+# reported total is a lower bound rather than an exact figure.
+TRANSACTIONS_COUNT_CAP = config('TRANSACTIONS_COUNT_CAP', cast=int, default=1000)
+# Maximum number of items accepted by POST /api/transactions/bulk/
+TRANSACTIONS_BULK_MAX_ITEMS = config('TRANSACTIONS_BULK_MAX_ITEMS', cast=int, default=1000)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -141,6 +157,10 @@ CORS_ALLOWED_ORIGINS = [
 # AI settings
 AI_FEATURES_ENABLED = config('AI_FEATURES_ENABLED', cast=bool, default=False)
 AI_SERVICE_URL = config('AI_SERVICE_URL', default='http://ai-service:8001')
+# Pooled connections to the AI service per process (= concurrent AI calls), and
+# how long a call may wait for a free one before answering 503 ai_busy.
+AI_MAX_CONNECTIONS = config('AI_MAX_CONNECTIONS', cast=int, default=20)
+AI_POOL_TIMEOUT = config('AI_POOL_TIMEOUT', cast=float, default=5.0)
 
 # drf-spectacular settings
 SPECTACULAR_SETTINGS = {
@@ -169,6 +189,39 @@ else:
         }
     }
 
+# Amounts are stored as integer cents (amount_cents). While older documents
+# still lack that field, amount filters also match the legacy float field.
+# Turn off once `manage.py migrate_amounts` reports nothing left to migrate.
+AMOUNT_LEGACY_FALLBACK = config('AMOUNT_LEGACY_FALLBACK', cast=bool, default=True)
+
+# Soft TTL of the per-user summary cache. Writes bump a per-user data version,
+# so this only bounds how long an idle entry lives, not staleness.
+SUMMARY_CACHE_TTL = config('SUMMARY_CACHE_TTL', cast=int, default=300)
+ANALYTICS_CACHE_TTL = config('ANALYTICS_CACHE_TTL', cast=int, default=300)
+# Rendered /api/transactions/ pages, keyed by user, filters, paging and data
+# version. 0 disables the page cache.
+TRANSACTIONS_PAGE_CACHE_TTL = config('TRANSACTIONS_PAGE_CACHE_TTL', cast=int, default=60)
+
+# Worker threads shared by /api/dashboard requests (4 reads per request)
+DASHBOARD_THREADS = config('DASHBOARD_THREADS', cast=int, default=16)
+
+# Bank sync worker (manage.py bank_sync_worker): how long a claimed schedule
+# stays leased before another worker may take it over.
+BANK_SYNC_LEASE_SECONDS = config('BANK_SYNC_LEASE_SECONDS', cast=int, default=300)
+
+# Shared secrets of push providers, "monobank:secret,privatbank:secret". A
+# webhook must carry X-Signature: hex HMAC-SHA256 of its body with that secret;
+# providers without a secret are refused.
+BANK_WEBHOOK_SECRETS = dict(
+    item.split(':', 1)
+    for item in config('BANK_WEBHOOK_SECRETS', default='').split(',')
+    if ':' in item
+)
+# Events accepted per webhook request
+BANK_WEBHOOK_MAX_EVENTS = config('BANK_WEBHOOK_MAX_EVENTS', cast=int, default=1000)
+# Failed ingests of one delivery before it goes to the dead-letter queue
+BANK_WEBHOOK_MAX_ATTEMPTS = config('BANK_WEBHOOK_MAX_ATTEMPTS', cast=int, default=10)
+
 # Logging (JSON if python-json-logger installed)
 LOG_LEVEL = config('LOG_LEVEL', default='INFO')
 
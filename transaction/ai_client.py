@@ -0,0 +1,70 @@
+"""Pooled async HTTP client for the AI service.
+
+Under ASGI (core/asgi.py) every request runs on the server's event loop, so
+one ``httpx.AsyncClient`` per loop is a single client for the whole process
+and keep-alive connections to the AI service are reused across requests.
+Async views served by WSGI (runserver, gunicorn) run each request on a
+throwaway loop instead; there ``session`` opens a client for the call and
+closes it afterwards, so no connections are left behind.
+
+``AI_MAX_CONNECTIONS`` caps the calls in flight; a call that waits longer
+than ``AI_POOL_TIMEOUT`` for a free connection fails with
+``httpx.PoolTimeout`` instead of queueing behind slow LLM calls.
+"""
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+# Set by core/asgi.py: the server's loop lives as long as the process
+_shared = False
+
+
+def use_shared_clients() -> None:
+    global _shared
+    _shared = True
+
+
+def timeout(read: float) -> httpx.Timeout:
+    """Per-call timeout: ``read`` seconds for the AI service to answer."""
+    return httpx.Timeout(read, connect=5.0, pool=settings.AI_POOL_TIMEOUT)
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=settings.AI_SERVICE_URL.rstrip('/'),
+        timeout=timeout(30),
+        limits=httpx.Limits(
+            max_connections=settings.AI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AI_MAX_CONNECTIONS,
+            keepalive_expiry=30,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """The running loop's shared client (only for long-lived loops)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _new_client()
+        _clients[loop] = client
+    return client
+
+
+@asynccontextmanager
+async def session() -> AsyncIterator[httpx.AsyncClient]:
+    """Client for one AI call: the shared one under ASGI, otherwise a
+    client closed when the call is done."""
+    if _shared:
+        yield get_client()
+        return
+    async with _new_client() as client:
+        yield client
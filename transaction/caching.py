@@ -0,0 +1,131 @@
+"""Versioned, stampede-safe caching helpers.
+
+Every user has a data version that write paths bump. Cache keys embed the
+current version, so a write makes older entries unreachable at once instead
+of serving them until a TTL runs out.
+
+``get_or_compute`` stores values together with a soft expiry. Past it, a
+single caller (guarded by a ``cache.add`` lock) recomputes while others keep
+serving the previous value; on a cold key, callers that lose the lock wait
+briefly for the winner, and one of them takes the lock over if the winner
+fails without storing a value. Values are wrapped, so empty results are cached too.
+Cache outages degrade to computing directly.
+"""
+from __future__ import annotations
+from typing import Any, Callable
+import time
+
+from django.core.cache import cache
+
+LOCK_TIMEOUT = 10  # seconds a recompute may hold the lock
+# How long a caller waits on a cold key for another worker's compute before
+# computing itself: about what the cached reads take, not LOCK_TIMEOUT.
+MAX_WAIT = 2.0
+WAIT_STEP = 0.05
+
+
+def _version_key(user_id: int) -> str:
+    return f"data_version:{user_id}"
+
+
+def _fresh_version() -> int:
+    # Time based so a version lost to eviction never repeats an old one
+    return time.time_ns() // 1000
+
+
+def data_version(user_id: int) -> int:
+    """Current data version of ``user_id`` (created on first use)."""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id: int) -> int:
+    """Invalidate everything cached under the user's current version."""
+    key = _version_key(user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:  # key missing or evicted
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def invalidate_user(user_id: int) -> None:
+    """Best-effort ``bump_data_version`` for write paths: a cache outage
+    must not fail a write that already reached Mongo."""
+    try:
+        bump_data_version(user_id)
+    except Exception:  # pragma: no cover - defensive
+        pass
+
+
+def _stats_key(name: str, event: str) -> str:
+    return f"cache_stats:{name}:{event}"
+
+
+def record_hit(name: str, hit: bool) -> None:
+    """Count a hit or miss of cache ``name``; see hit_stats."""
+    key = _stats_key(name, 'hits' if hit else 'misses')
+    try:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except Exception:  # counters are best effort
+        pass
+
+
+def hit_stats(name: str) -> dict:
+    """Hits, misses and hit rate of cache ``name`` since the last reset."""
+    hits = cache.get(_stats_key(name, 'hits')) or 0
+    misses = cache.get(_stats_key(name, 'misses')) or 0
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def reset_hit_stats(name: str) -> None:
+    cache.delete_many([_stats_key(name, 'hits'), _stats_key(name, 'misses')])
+
+
+def get_or_compute(key: str, compute: Callable[[], Any], *, timeout: int) -> Any:
+    """Return the cached value for ``key``, computing it at most once at a time."""
+    try:
+        entry = cache.get(key)
+    except Exception:  # cache backend down: serve uncached
+        return compute()
+    lock_key = f"{key}:lock"
+    if entry is not None:
+        value, refresh_at = entry
+        if time.time() < refresh_at or not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            # Fresh, or another worker is already refreshing: serve as is
+            return value
+        return _fill(key, lock_key, compute, timeout)
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return _fill(key, lock_key, compute, timeout)
+    deadline = time.time() + MAX_WAIT
+    while time.time() < deadline:
+        time.sleep(WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        # The holder failed (its lock is gone, nothing stored): take over
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return _fill(key, lock_key, compute, timeout)
+    return compute()
+
+
+def _fill(key: str, lock_key: str, compute: Callable[[], Any], timeout: int) -> Any:
+    try:
+        value = compute()
+        # Keep the entry past its soft expiry so it can be served while
+        # one worker refreshes it.
+        cache.set(key, (value, time.time() + timeout), timeout * 2)
+        return value
+    finally:
+        cache.delete(lock_key)
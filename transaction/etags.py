@@ -0,0 +1,73 @@
+"""Conditional GET for per-user endpoints.
+
+The ETag of a response is derived from the user's data version (see
+transaction.caching), the endpoint and its query parameters, so it can be
+checked before any database work: a matching ``If-None-Match`` gets a 304
+straight away. The version is read before the view runs, so a write racing
+the query can only make the tag older than the body, never newer; the next
+poll then simply refetches. Responses that also depend on the clock (the
+default month of budgets, "today" of goal forecasts) pass a ``context`` that
+goes into the tag the same way.
+"""
+from __future__ import annotations
+from typing import Callable
+import functools
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .caching import data_version
+
+
+def user_etag(user_id: int, scope: str, params=None, context: str = '') -> str:
+    """Strong ETag for ``scope`` of ``user_id`` with query ``params``."""
+    items = sorted(params.lists()) if params is not None else []
+    raw = f"{scope}:{user_id}:{data_version(user_id)}:{items!r}:{context}"
+    return '"%s"' % hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def _matches(etag: str, header: str | None) -> bool:
+    if not header:
+        return False
+    # Weak comparison, as for If-None-Match in RFC 9110
+    tags = {t[2:] if t.startswith('W/') else t for t in parse_etags(header)}
+    return '*' in tags or etag in tags
+
+
+def conditional(scope: str, context: Callable | None = None) -> Callable:
+    """Decorate a GET handler ``(self, request, ...)`` with ETag support.
+
+    ``context(request)`` returns anything else the body depends on besides
+    the data version and query (evaluated before the view, like the version).
+    Only plain 200 responses get tagged: views mark degraded fallbacks
+    (served while the database is down) with their own ``Cache-Control``.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                # JSON and the browsable API are different representations
+                media = getattr(request, 'accepted_media_type', '')
+                etag = user_etag(
+                    request.user.id, scope, request.query_params,
+                    f"{media}:{context(request) if context else ''}",
+                )
+            except Exception:  # cache backend down: serve unconditionally
+                return method(self, request, *args, **kwargs)
+            if _matches(etag, request.headers.get('If-None-Match')):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK or response.has_header(
+                    'Cache-Control'
+                ):
+                    return response
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            patch_vary_headers(response, ['Authorization', 'Accept'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,103 @@
+"""Savings forecasts for goals from the user's monthly net cash flow.
+
+One aggregation over the monthly rollups yields net cents per month; NumPy
+turns that into a dense series (months without activity count as zero) and an
+exponentially weighted savings rate, so recent months matter most. Goals are
+then projected together as arrays: no Python loop touches transactions.
+"""
+from __future__ import annotations
+from datetime import date, timedelta
+from typing import Sequence
+
+import numpy as np
+
+from .models import Goal, MonthlyRollup
+from .money import cents_of, from_cents
+
+HALF_LIFE_MONTHS = 6  # weight of a month's net halves every 6 months
+AVG_MONTH_DAYS = 365.25 / 12
+MAX_PROJECTION_DAYS = 100 * 365  # further out counts as never
+
+
+def _month_index(key: str) -> int:
+    return int(key[:4]) * 12 + int(key[5:7]) - 1
+
+
+def monthly_net(user_id: int, today: date) -> np.ndarray:
+    """Net cents (income - expense) per complete month, oldest first,
+    ending with the month before ``today``."""
+    current = f"{today.year:04d}-{today.month:02d}"
+    coll = MonthlyRollup._get_collection()  # pylint: disable=protected-access
+    rows = list(coll.aggregate([
+        {"$match": {"user_id": user_id, "month": {"$lt": current}}},
+        {"$group": {
+            "_id": "$month",
+            "net": {"$sum": {"$cond": [
+                {"$eq": ["$type", "income"]},
+                "$total_cents",
+                {"$subtract": [0, "$total_cents"]},
+            ]}},
+        }},
+    ]))
+    if not rows:
+        return np.zeros(0)
+    idx = np.fromiter((_month_index(r["_id"]) for r in rows), dtype=np.int64, count=len(rows))
+    net = np.fromiter((r["net"] for r in rows), dtype=np.float64, count=len(rows))
+    last = _month_index(current) - 1
+    series = np.zeros(last - idx.min() + 1)
+    series[idx - idx.min()] = net
+    return series
+
+
+def savings_rate(series: np.ndarray) -> float:
+    """Exponentially weighted mean of monthly net cents (0 without history)."""
+    if not series.size:
+        return 0.0
+    age = np.arange(series.size - 1, -1, -1)
+    weights = 0.5 ** (age / HALF_LIFE_MONTHS)
+    return float(weights @ series / weights.sum())
+
+
+def _cents(goal: Goal, cents_field: str, legacy_field: str) -> int:
+    return cents_of(goal, cents_field, legacy_field) or 0
+
+
+def forecast_goals(goals: Sequence[Goal], rate: float, today: date) -> list[dict | None]:
+    """Per goal (same order): projected completion date, monthly amount
+    still required to meet the due date, and whether the current savings rate
+    gets there in time. None for goals without a target or due date.
+
+    Every goal is projected against the full savings rate on its own.
+    """
+    eligible = [
+        i for i, g in enumerate(goals)
+        if getattr(g, "due_date", None) and _cents(g, "target_cents", "target_amount")
+    ]
+    result: list[dict | None] = [None] * len(goals)
+    if not eligible:
+        return result
+    picked = [goals[i] for i in eligible]
+    target = np.array([_cents(g, "target_cents", "target_amount") for g in picked])
+    current = np.array([_cents(g, "current_cents", "current_amount") for g in picked])
+    remaining = np.maximum(target - current, 0).astype(np.float64)
+    days_left = np.array([(g.due_date.date() - today).days for g in picked], dtype=np.float64)
+
+    required = remaining / np.maximum(days_left / AVG_MONTH_DAYS, 1.0)
+    if rate > 0:
+        days_needed = np.ceil(remaining / rate * AVG_MONTH_DAYS)
+    else:
+        days_needed = np.where(remaining == 0, 0.0, np.inf)
+    reachable = days_needed <= MAX_PROJECTION_DAYS
+    on_track = reachable & ((remaining == 0) | (days_needed <= days_left))
+
+    for pos, i in enumerate(eligible):
+        projected = (
+            today + timedelta(days=int(days_needed[pos])) if reachable[pos] else None
+        )
+        result[i] = {
+            "monthly_savings": from_cents(round(rate)),
+            "required_monthly": from_cents(int(np.ceil(required[pos]))),
+            "projected_completion": projected.isoformat() if projected else None,
+            "on_track": bool(on_track[pos]),
+        }
+    return result
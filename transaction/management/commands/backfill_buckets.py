@@ -0,0 +1,51 @@
+"""Fill the denormalized ``day`` / ``month`` fields on older transactions.
+
+Batched and resumable like migrate_amounts: documents missing ``month`` are
+walked in _id order and each batch is bucketed server-side with a single
+pipeline update, so no dates are shipped to Python and back.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from transaction.models import Transaction
+
+BUCKETS = [{
+    "$set": {
+        "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+        "month": {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}},
+    }
+}]
+
+
+class Command(BaseCommand):
+    help = "Backfill day/month bucket fields on transactions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between batches to limit load',
+        )
+
+    def handle(self, *args, **opts):
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        query = {"month": {"$exists": False}}
+        last_id = None
+        done = 0
+        while True:
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            ids = [
+                d["_id"] for d in
+                coll.find(query, {"_id": 1}).sort("_id", 1).limit(opts['batch_size'])
+            ]
+            if not ids:
+                break
+            coll.update_many({"_id": {"$in": ids}}, BUCKETS)
+            done += len(ids)
+            last_id = ids[-1]
+            self.stdout.write(f'{done} transactions bucketed')
+            if opts['pause']:
+                time.sleep(opts['pause'])
+        self.stdout.write(self.style.SUCCESS(f'done: {done} transactions bucketed'))
@@ -0,0 +1,149 @@
+"""Run queued sync-now jobs and due bank syncs from BankSyncSchedule.
+
+Claims queued BankSyncJobs first (a user is waiting on those), then due
+schedules, in batches under a lease (safe with any number of worker
+processes). Syncs run on a bounded thread pool; schedules are rescheduled
+with jitter and jobs get their outcome recorded. Every ``--report-every``
+seconds it prints throughput and lag (how late a job or schedule was picked
+up relative to its created_at / next_run_at). Failing claims and lease
+updates are logged and retried (an unrecorded lease simply expires), so a
+transient database error never stops the worker.
+
+Usage: python manage.py bank_sync_worker [--concurrency 8] [--once]
+"""
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+import logging
+import os
+import socket
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from transaction.services import BankSyncJobService, BankSyncService
+
+logger = logging.getLogger("app.bank_sync")
+
+
+class Metrics:
+    """Counters for one reporting window."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.synced = 0
+        self.failed = 0
+        self.lags: list[float] = []
+
+    def report(self) -> dict:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        lags = sorted(self.lags)
+        return {
+            "synced": self.synced,
+            "failed": self.failed,
+            "per_second": round((self.synced + self.failed) / elapsed, 2),
+            "lag_avg_s": round(sum(lags) / len(lags), 1) if lags else None,
+            "lag_p95_s": round(lags[int((len(lags) - 1) * 0.95)], 1) if lags else None,
+            "lag_max_s": round(lags[-1], 1) if lags else None,
+        }
+
+
+def _run(schedule: dict, worker_id: str) -> str | None:
+    """Sync one claimed schedule; returns an error string on failure."""
+    error = None
+    try:
+        BankSyncService.sync_user(schedule["user_id"])
+    except Exception as exc:  # one failing user must not stop the worker
+        error = f"{exc.__class__.__name__}: {exc}"[:500]
+    try:
+        BankSyncService.complete(schedule, worker_id, error=error)
+    except Exception:
+        # The lease expires and another claim retries the sync
+        logger.exception("bank_sync", extra={"event": "bank_sync_complete_failed"})
+    return error
+
+
+def _claim(worker_id: str, free: int) -> tuple[list[dict], list[dict]] | None:
+    """Queued jobs, then due schedules, for up to ``free`` slots; None when
+    claiming failed (e.g. Mongo unreachable), to be retried after a poll."""
+    jobs, claimed = [], []
+    try:
+        if free:
+            jobs = BankSyncJobService.claim(worker_id, free)
+        if free - len(jobs):
+            claimed = BankSyncService.claim_due(worker_id, free - len(jobs))
+    except Exception:
+        logger.exception("bank_sync", extra={"event": "bank_sync_claim_failed"})
+        return None
+    return jobs, claimed
+
+
+def _run_job(job: dict, worker_id: str) -> str | None:
+    """Run one claimed sync-now job; returns an error string on failure."""
+    result, error = None, None
+    try:
+        result = BankSyncJobService.run(job)
+    except Exception as exc:  # recorded on the job for the status endpoint
+        error = f"{exc.__class__.__name__}: {exc}"[:500]
+    try:
+        BankSyncJobService.finish(job, worker_id, result=result, error=error)
+    except Exception:
+        # The lease expires and another claim reruns the job
+        logger.exception("bank_sync", extra={"event": "bank_sync_finish_failed"})
+    return error
+
+
+class Command(BaseCommand):
+    help = "Claim queued sync jobs and due bank sync schedules under leases and run them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help='Syncs in flight')
+        parser.add_argument('--poll', type=float, default=5.0, help='Idle sleep in seconds')
+        parser.add_argument('--report-every', type=float, default=60.0)
+        parser.add_argument('--once', action='store_true', help='Drain due work and exit')
+
+    def handle(self, *args, **opts):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        concurrency = max(1, opts['concurrency'])
+        metrics = Metrics()
+        inflight = {}
+        self.stdout.write(f'bank sync worker {worker_id} (concurrency {concurrency})')
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                claims = _claim(worker_id, concurrency - len(inflight))
+                jobs, claimed = claims or ([], [])
+                now = datetime.utcnow()
+                for job in jobs:
+                    metrics.lags.append((now - job["created_at"]).total_seconds())
+                    inflight[pool.submit(_run_job, job, worker_id)] = job
+                for schedule in claimed:
+                    metrics.lags.append((now - schedule["next_run_at"]).total_seconds())
+                    inflight[pool.submit(_run, schedule, worker_id)] = schedule
+                if inflight:
+                    done, _ = wait(
+                        inflight, timeout=None if jobs or claimed else opts['poll'],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        inflight.pop(future)
+                        if future.result() is None:
+                            metrics.synced += 1
+                        else:
+                            metrics.failed += 1
+                elif opts['once'] and claims is not None:
+                    break
+                else:
+                    time.sleep(opts['poll'])
+                if time.monotonic() - metrics.started >= opts['report_every']:
+                    self._report(metrics)
+        self._report(metrics)
+
+    def _report(self, metrics: Metrics):
+        stats = metrics.report()
+        logger.info("bank_sync", extra={"event": "bank_sync_metrics", **stats})
+        self.stdout.write(' '.join(f'{k}={v}' for k, v in stats.items()))
+        metrics.reset()
@@ -0,0 +1,85 @@
+"""Apply buffered bank webhook events (see transaction.webhooks).
+
+Claims up to ``--batch-size`` queued deliveries at a time and ingests them in
+one go: one bulk upsert into transactions, one last_synced_at update for the
+touched connections and one cache invalidation per user. If a batch fails,
+its deliveries are retried one by one to isolate the failing ones; those go
+back to the tail of the queue and, after BANK_WEBHOOK_MAX_ATTEMPTS failures,
+to the dead-letter queue (``--requeue-dead`` moves them back). Claimed
+deliveries are only acknowledged after that, and a starting worker requeues
+those of workers that died first. Upserts make every retry safe.
+
+Usage: python manage.py bank_webhook_worker [--batch-size 500] [--once]
+"""
+from __future__ import annotations
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from transaction import webhooks
+from transaction.services import BankWebhookService
+
+logger = logging.getLogger("app.bank_webhooks")
+
+
+def _ingest(batches: list[dict]) -> dict:
+    """Ingest ``batches``, falling back to one delivery at a time."""
+    try:
+        return BankWebhookService.ingest(batches)
+    except Exception:
+        logger.exception("bank_webhooks", extra={"event": "bank_webhook_batch_failed"})
+    stats = {"events": 0, "created": 0, "skipped": 0, "failed": 0, "dead_lettered": 0}
+    failed = []
+    for batch in batches:
+        try:
+            one = BankWebhookService.ingest([batch])
+        except Exception:
+            failed.append(batch)
+            stats["failed"] += len(batch.get("events") or [])
+            continue
+        for k, v in one.items():
+            stats[k] += v
+    stats["dead_lettered"] = webhooks.retry_or_dead_letter(failed)
+    return stats
+
+
+class Command(BaseCommand):
+    help = "Apply queued bank webhook events in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500, help='Webhook deliveries per batch'
+        )
+        parser.add_argument('--poll', type=float, default=1.0, help='Idle sleep in seconds')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+        parser.add_argument(
+            '--requeue-dead', action='store_true',
+            help='Move dead-lettered deliveries back to the queue and exit',
+        )
+
+    def handle(self, *args, **opts):
+        worker = webhooks.worker_id()
+        if opts['requeue_dead']:
+            self.stdout.write(f'requeued={webhooks.requeue_dead_letters(worker)}')
+            return
+        recovered = webhooks.recover(worker)
+        if recovered:
+            self.stdout.write(f'recovered={recovered}')
+        batch_size = max(1, opts['batch_size'])
+        while True:
+            webhooks.heartbeat(worker)
+            batches = webhooks.claim_batches(batch_size, worker)
+            if not batches:
+                if opts['once']:
+                    break
+                time.sleep(opts['poll'])
+                continue
+            started = time.monotonic()
+            stats = _ingest(batches)
+            webhooks.ack(worker)
+            stats["seconds"] = round(time.monotonic() - started, 3)
+            logger.info("bank_webhooks", extra={"event": "bank_webhook_batch", "stats": stats})
+            self.stdout.write(' '.join(f'{k}={v}' for k, v in stats.items()))
+            if stats.get("failed"):
+                time.sleep(opts['poll'])  # likely an outage: do not spin on retries
@@ -0,0 +1,24 @@
+"""Print hit/miss counters of the response caches (shared via the cache
+backend, so the figures cover every worker)."""
+from django.core.management.base import BaseCommand
+
+from transaction.caching import hit_stats, reset_hit_stats
+
+CACHE_NAMES = ('tx_page',)
+
+
+class Command(BaseCommand):
+    help = "Show (and optionally reset) cache hit-rate counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters afterwards')
+
+    def handle(self, *args, **opts):
+        for name in CACHE_NAMES:
+            stats = hit_stats(name)
+            rate = '-' if stats['hit_rate'] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(
+                f"{name}: {stats['hits']} hits, {stats['misses']} misses, hit rate {rate}"
+            )
+            if opts['reset']:
+                reset_hit_stats(name)
@@ -0,0 +1,35 @@
+"""Drop transaction indexes that are prefixes of another index.
+
+MongoEngine creates the indexes declared on a model but never removes old
+ones, so databases created before they were pruned from Transaction.meta
+still maintain them on every write. Each one is covered by a longer index:
+
+- user_created_desc, user_created_id_desc: by user_created_amount
+- user_category: by user_category_created_desc
+- user_type: by user_type_created_desc
+"""
+from django.core.management.base import BaseCommand
+
+from transaction.models import Transaction
+
+REDUNDANT_INDEXES = ('user_created_desc', 'user_created_id_desc', 'user_category', 'user_type')
+
+
+class Command(BaseCommand):
+    help = "Drop transaction indexes covered by a longer index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list them')
+
+    def handle(self, *args, **opts):
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        present = set(coll.index_information())
+        dropped = 0
+        for name in REDUNDANT_INDEXES:
+            if name not in present:
+                continue
+            if not opts['dry_run']:
+                coll.drop_index(name)
+            dropped += 1
+            self.stdout.write(f'{"would drop" if opts["dry_run"] else "dropped"} {name}')
+        self.stdout.write(self.style.SUCCESS(f'done: {dropped} indexes'))
@@ -0,0 +1,48 @@
+"""Import a CSV/OFX bank statement file for a user.
+
+Same pipeline as POST /api/transactions/import/, for migrations run from
+the shell. Re-running on the same file only reports duplicates.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from transaction.importers import IMPORT_FORMATS, import_statement
+
+
+class Command(BaseCommand):
+    help = "Import a CSV or OFX bank statement into a user's transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='User id or username')
+        parser.add_argument('--fmt', choices=IMPORT_FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        ident = opts['user']
+        lookup = {'id': int(ident)} if ident.isdigit() else {'username': ident}
+        user = User.objects.filter(**lookup).first()
+        if not user:
+            raise CommandError(f'unknown user: {ident}')
+        path = opts['path']
+        fmt = opts['fmt'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError(f'cannot infer format from {path}; pass --fmt')
+
+        def progress(report):
+            self.stdout.write(
+                'processed={processed} created={created} '
+                'duplicates={duplicates} failed={failed}'.format(**report)
+            )
+
+        with open(path, 'rb') as fh:
+            report = import_statement(
+                user.id, fh, fmt, chunk_size=opts['chunk_size'], progress=progress
+            )
+        for err in report['errors']:
+            self.stderr.write(f"row {err['row']}: {err['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            'done: processed={processed} created={created} '
+            'duplicates={duplicates} failed={failed}'.format(**report)
+        ))
@@ -0,0 +1,67 @@
+"""Backfill integer cents fields from the legacy float amounts.
+
+Online and resumable: documents are walked in _id order in small batches,
+each batch is one unordered bulk_write, and only documents still missing
+the cents field are touched, so the command can be stopped and rerun at any
+time while the API keeps serving (readers fall back to the float field).
+
+Afterwards run ``rebuild_rollups`` and set AMOUNT_LEGACY_FALLBACK=false.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+
+from transaction.models import Goal, Transaction
+from transaction.money import to_cents
+
+# collection document class -> (legacy field, cents field) pairs
+TARGETS = (
+    (Transaction, (("amount", "amount_cents"),)),
+    (Goal, (("target_amount", "target_cents"), ("current_amount", "current_cents"))),
+)
+
+
+class Command(BaseCommand):
+    help = "Migrate monetary amounts to integer cents in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between batches to limit load',
+        )
+
+    def handle(self, *args, **opts):
+        for doc_cls, fields in TARGETS:
+            coll = doc_cls._get_collection()  # pylint: disable=protected-access
+            done = self._migrate(coll, fields, opts['batch_size'], opts['pause'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{coll.name}: migrated {done} documents'
+            ))
+
+    def _migrate(self, coll, fields, batch_size: int, pause: float) -> int:
+        missing = {"$or": [{cents: {"$exists": False}} for _, cents in fields]}
+        projection = {legacy: 1 for legacy, _ in fields}
+        last_id = None
+        done = 0
+        while True:
+            query = dict(missing)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = list(coll.find(query, projection).sort("_id", 1).limit(batch_size))
+            if not batch:
+                return done
+            ops = [
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {cents: to_cents(doc.get(legacy)) for legacy, cents in fields}},
+                )
+                for doc in batch
+            ]
+            coll.bulk_write(ops, ordered=False)
+            done += len(batch)
+            last_id = batch[-1]["_id"]
+            self.stdout.write(f'{coll.name}: {done} documents migrated')
+            if pause:
+                time.sleep(pause)
@@ -0,0 +1,26 @@
+"""Backfill MonthlyRollup documents from the transactions collection.
+
+Needed once after deploying rollups, and any time they drift (e.g. after
+manual edits in Mongo). Rebuilds one user at a time.
+"""
+from django.core.management.base import BaseCommand
+
+from transaction.services import RollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-user monthly transaction rollups from raw data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only rebuild this user id')
+
+    def handle(self, *args, **opts):
+        user_ids = [opts['user']] if opts['user'] else RollupService.user_ids()
+        written = 0
+        for n, user_id in enumerate(user_ids, 1):
+            written += RollupService.rebuild_user(user_id)
+            if n % 100 == 0:
+                self.stdout.write(f'{n}/{len(user_ids)} users')
+        self.stdout.write(self.style.SUCCESS(
+            f'updated {written} rollups for {len(user_ids)} users'
+        ))
@@ -0,0 +1,44 @@
+"""Rebuild the spend counters behind budgets from raw transactions.
+
+Budget spend is read from the monthly rollups, which writes keep current
+with $inc. This recomputes them (RollupService.rebuild_user) for every user
+with a budget, batches of users running in parallel worker threads.
+
+Safe to run against live traffic: each user is rebuilt by one thread only,
+and a rebuild overwrites just the counters that drifted (per-key upserts,
+no delete-and-reinsert), so budget reads never see spend drop to zero.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from transaction.services import BudgetService, RollupService
+
+
+def _rebuild_batch(user_ids: list[int]) -> int:
+    return sum(RollupService.rebuild_user(user_id) for user_id in user_ids)
+
+
+class Command(BaseCommand):
+    help = "Recompute budget spend counters (monthly rollups) from transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only reconcile this user id')
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=50, help='Users per batch')
+
+    def handle(self, *args, **opts):
+        # Distinct ids: two threads must never rebuild the same user
+        user_ids = [opts['user']] if opts['user'] else sorted(set(BudgetService.user_ids()))
+        size = max(1, opts['batch_size'])
+        batches = [user_ids[i:i + size] for i in range(0, len(user_ids), size)]
+        repaired = done = 0
+        with ThreadPoolExecutor(max_workers=max(1, opts['workers'])) as pool:
+            futures = {pool.submit(_rebuild_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                repaired += future.result()
+                done += len(futures[future])
+                self.stdout.write(f'{done}/{len(user_ids)} users')
+        self.stdout.write(self.style.SUCCESS(
+            f'repaired {repaired} drifted counters for {len(user_ids)} users'
+        ))
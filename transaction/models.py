@@ -1,4 +1,5 @@
 from mongoengine import (
+    BooleanField,
     Document,
     StringField,
     IntField,
@@ -6,24 +7,114 @@ from mongoengine import (
     DecimalField,
 )
 from datetime import datetime
+from .money import to_cents
 
 
 class Transaction(Document):
     meta = {
         'collection': 'transactions',
+        # No index that is a prefix of another one: the longer index serves
+        # the same queries (see drop_redundant_indexes for older databases).
         'indexes': [
-            {'fields': ['user_id', '-created_at'], 'name': 'user_created_desc'},
-            {'fields': ['user_id', 'category'], 'name': 'user_category'},
-            {'fields': ['user_id', 'type'], 'name': 'user_type'},
+            # Filtered listings (equality, then the list sort, then ranges);
+            # see list_user_transactions_filtered and test_query_plans.
+            {
+                'fields': ['user_id', 'category', '-created_at', '-id'],
+                'name': 'user_category_created_desc',
+            },
+            {
+                'fields': ['user_id', 'type', '-created_at', '-id'],
+                'name': 'user_type_created_desc',
+            },
+            # Also the (created_at, _id) desc keyset sort of unfiltered listings
+            {
+                'fields': ['user_id', '-created_at', '-id', 'amount_cents'],
+                'name': 'user_created_amount',
+            },
+            # Merchant search (?q=): text index scoped by an equality on user_id
+            {
+                'fields': ['user_id', '$description', '$category'],
+                'name': 'user_text',
+                'weights': {'category': 2, 'description': 1},
+                'default_language': 'none',  # merchant names: no stemming/stop words
+            },
+            # Statement imports: the same row is never stored twice per user
+            {
+                'fields': ['user_id', 'import_hash'],
+                'name': 'user_import_hash',
+                'unique': True,
+                'partialFilterExpression': {'import_hash': {'$type': 'string'}},
+            },
+            # Bank sync: one document per provider transaction and connection
+            {
+                'fields': ['bank_connection_id', 'provider_tx_id'],
+                'name': 'connection_provider_tx',
+                'unique': True,
+                'partialFilterExpression': {'provider_tx_id': {'$type': 'string'}},
+            },
         ],
     }
 
     user_id = IntField(required=True)  # Django auth user id
     type = StringField(required=True, choices=('income', 'expense'))
     amount = DecimalField(precision=2, rounding='ROUND_HALF_UP', required=True)
+    # Exact amount in minor units; written alongside the legacy float field
+    amount_cents = IntField(null=True)
     category = StringField(required=True, max_length=150)
     description = StringField(default='')
     created_at = DateTimeField(default=datetime.utcnow)
+    # Denormalized UTC buckets of created_at: 'YYYY-MM-DD' / 'YYYY-MM'
+    day = StringField(null=True)
+    month = StringField(null=True)
+    # Content hash of the statement row this transaction was imported from
+    import_hash = StringField(null=True)
+    # Set on transactions fetched from a bank connection
+    bank_connection_id = StringField(null=True)
+    provider_tx_id = StringField(null=True)
+
+    def clean(self):
+        self.amount_cents = to_cents(self.amount)
+        if self.created_at:
+            self.day = self.created_at.strftime('%Y-%m-%d')
+            self.month = self.created_at.strftime('%Y-%m')
+
+
+class MonthlyRollup(Document):
+    """Per-user totals by (month, category, type), kept current with $inc
+    on every transaction insert. See RollupService."""
+    meta = {
+        'collection': 'transaction_rollups',
+        'indexes': [
+            {
+                'fields': ['user_id', 'month', 'category', 'type'],
+                'name': 'user_month_category_type',
+                'unique': True,
+            },
+        ],
+    }
+
+    user_id = IntField(required=True)
+    month = StringField(required=True)  # 'YYYY-MM' of created_at (UTC)
+    category = StringField(required=True, max_length=150)
+    type = StringField(required=True, choices=('income', 'expense'))
+    total_cents = IntField(default=0)  # exact sum in cents
+    count = IntField(default=0)
+
+
+class Budget(Document):
+    """Monthly spending limit for one category. Spend is not stored here:
+    the month's expense rollup is the live $inc counter (BudgetService)."""
+    meta = {
+        'collection': 'budgets',
+        'indexes': [
+            {'fields': ['user_id', 'category'], 'name': 'user_category', 'unique': True},
+        ],
+    }
+
+    user_id = IntField(required=True)
+    category = StringField(required=True, max_length=150)
+    limit_cents = IntField(required=True, min_value=0)
+    updated_at = DateTimeField(default=datetime.utcnow)
 
 
 class Goal(Document):
@@ -32,6 +123,12 @@ class Goal(Document):
         'indexes': [
             {'fields': ['user_id', 'title'], 'name': 'user_title'},
             {'fields': ['user_id', '-due_date'], 'name': 'user_due_desc'},
+            # Goals whose progress follows transactions in a category
+            {
+                'fields': ['user_id', 'category'],
+                'name': 'user_category',
+                'partialFilterExpression': {'category': {'$type': 'string'}},
+            },
         ],
     }
 
@@ -40,10 +137,19 @@ class Goal(Document):
     # Make fields optional to be compatible with simplified frontend goals
     target_amount = DecimalField(precision=2, rounding='ROUND_HALF_UP', required=False, null=True)
     current_amount = DecimalField(precision=2, rounding='ROUND_HALF_UP', default=0)
+    target_cents = IntField(null=True)
+    current_cents = IntField(null=True)
     due_date = DateTimeField(required=False, null=True)
     # Frontend-specific fields
     description = StringField(default='')
     image = StringField(default='/vercel.svg')
+    # Transactions created in this category add to current_cents ($inc on
+    # write, see GoalService.apply_transactions)
+    category = StringField(max_length=150, null=True)
+
+    def clean(self):
+        self.target_cents = to_cents(self.target_amount)
+        self.current_cents = to_cents(self.current_amount)
 
 
 class BankConnection(Document):
@@ -62,6 +168,8 @@ class BankConnection(Document):
         'connected', 'pending', 'error', 'disconnected'
     ), default='pending')
     last_synced_at = DateTimeField(default=None)
+    # Provider-defined position of the last sync; the next one resumes here
+    sync_watermark = StringField(default=None, null=True)
 
 
 class BankSyncSchedule(Document):
@@ -70,6 +178,8 @@ class BankSyncSchedule(Document):
         'indexes': [
             {'fields': ['user_id'], 'name': 'user_only', 'unique': True},
             {'fields': ['next_run_at'], 'name': 'next_run'},
+            # Due-schedule claims: equality on enabled, then the due range
+            {'fields': ['enabled', 'next_run_at'], 'name': 'enabled_next_run'},
         ],
     }
 
@@ -77,3 +187,44 @@ class BankSyncSchedule(Document):
     enabled = IntField(default=0)  # 0/1 to keep it simple in Mongo
     interval_hours = IntField(default=2)
     next_run_at = DateTimeField(default=None)
+    # Worker lease (BankSyncService.claim_due): a schedule is only claimable
+    # while lease_until is unset or in the past.
+    lease_until = DateTimeField(default=None)
+    leased_by = StringField(default=None, null=True)
+    last_run_at = DateTimeField(default=None)
+    last_error = StringField(default=None, null=True)
+
+
+class BankSyncJob(Document):
+    """One requested sync of a bank connection, run by bank_sync_worker
+    (BankSyncJobService). ``active`` stays true while queued or running; the
+    partial unique index allows one active job per connection."""
+    meta = {
+        'collection': 'bank_sync_jobs',
+        'indexes': [
+            {
+                'fields': ['connection_id'],
+                'name': 'connection_active',
+                'unique': True,
+                'partialFilterExpression': {'active': True},
+            },
+            {'fields': ['status', 'created_at'], 'name': 'status_created'},
+            {'fields': ['user_id', '-created_at'], 'name': 'user_created_desc'},
+        ],
+    }
+
+    user_id = IntField(required=True)
+    connection_id = StringField(required=True)
+    status = StringField(required=True, choices=(
+        'queued', 'running', 'done', 'failed'
+    ), default='queued')
+    active = BooleanField(default=True)
+    created_at = DateTimeField(default=datetime.utcnow)
+    started_at = DateTimeField(default=None)
+    finished_at = DateTimeField(default=None)
+    # Worker lease while running, as on BankSyncSchedule
+    lease_until = DateTimeField(default=None)
+    leased_by = StringField(default=None, null=True)
+    fetched = IntField(default=None, null=True)
+    created = IntField(default=None, null=True)
+    error = StringField(default=None, null=True)
@@ -0,0 +1,46 @@
+"""Integer minor-unit (cents) helpers for monetary amounts.
+
+Amounts are stored as exact integer cents next to the legacy ``amount``
+DecimalField, which MongoEngine persists as a float. Until every document has
+been migrated (``manage.py migrate_amounts``) readers fall back to the legacy
+field; the aggregation expressions below do the same on the Mongo side.
+"""
+from __future__ import annotations
+from decimal import Decimal, ROUND_HALF_UP
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> int | None:
+    """Convert a Decimal/float/str amount to integer cents (half-up)."""
+    if value is None:
+        return None
+    return int(Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents: int | None) -> float | None:
+    return None if cents is None else cents / 100
+
+
+def cents_of(doc, cents_field: str = "amount_cents", legacy_field: str = "amount"):
+    """Dual read: integer cents if present, else converted legacy value.
+
+    ``doc`` is a raw document (dict) or a Document instance.
+    """
+    if isinstance(doc, dict):
+        cents, legacy = doc.get(cents_field), doc.get(legacy_field)
+    else:
+        cents, legacy = getattr(doc, cents_field, None), getattr(doc, legacy_field, None)
+    if cents is not None:
+        return cents
+    return to_cents(legacy)
+
+
+def cents_expr(cents_field: str = "amount_cents", legacy_field: str = "amount") -> dict:
+    """Aggregation expression yielding integer cents with the same fallback."""
+    return {
+        "$ifNull": [
+            f"${cents_field}",
+            {"$toLong": {"$round": [{"$multiply": [f"${legacy_field}", 100]}, 0]}},
+        ]
+    }
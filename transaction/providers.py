@@ -0,0 +1,165 @@
+"""Bank provider adapters.
+
+An adapter turns a BankConnection and its stored watermark into a batch of
+normalized transaction rows plus the watermark to store afterwards. Rows carry
+a ``provider_tx_id`` that is stable across fetches, so feeds may overlap
+(BankSyncService upserts on it). Adapters are registered in ``PROVIDERS``;
+the provider list endpoint is built from that registry.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import NamedTuple
+import hashlib
+import random
+
+from .serializers import TransactionSerializer
+
+MAX_PROVIDER_TX_ID_LENGTH = 128
+
+
+class FetchResult(NamedTuple):
+    rows: list[dict]  # type, amount, category, description, created_at, provider_tx_id
+    watermark: str | None
+
+
+class BankProvider(ABC):
+    id: str = ''
+    name: str = ''
+    # Push-based providers deliver transactions through webhooks instead
+    polling: bool = True
+
+    @abstractmethod
+    def fetch(self, connection, watermark: str | None) -> FetchResult:
+        """Transactions booked since ``watermark`` (None: initial history)."""
+
+    def describe(self) -> dict:
+        return {'id': self.id, 'name': self.name}
+
+
+class PushProvider(BankProvider):
+    """Provider whose transactions arrive by webhook; polling fetches nothing.
+
+    Webhook events use one normalized shape: ``connectionId`` (our
+    BankConnection id), ``id`` (the provider's transaction id), ``type``,
+    ``amount``, ``category``, optional ``description`` and ``time`` (ISO 8601).
+    Providers with their own payload format override ``parse_event``.
+    """
+    polling = False
+
+    def __init__(self, provider_id: str, name: str):
+        self.id = provider_id
+        self.name = name
+
+    def fetch(self, connection, watermark: str | None) -> FetchResult:
+        return FetchResult([], watermark)
+
+    def parse_event(self, event: dict) -> dict | None:
+        """Transaction row of one webhook event; None if it is malformed.
+
+        Type, amount, category and description are validated exactly like
+        ``POST /api/transactions/`` (TransactionSerializer), so a stored
+        event always fits the schema (e.g. no amounts beyond int64 cents).
+        """
+        if not isinstance(event, dict):
+            return None
+        ser = TransactionSerializer(data=event)
+        tx_id = event.get('id')
+        if not ser.is_valid() or not isinstance(tx_id, (str, int)):
+            return None
+        tx_id = str(tx_id)
+        if not tx_id or len(tx_id) > MAX_PROVIDER_TX_ID_LENGTH:
+            return None
+        row = ser.validated_data
+        if row['amount'] <= 0:
+            return None
+        try:
+            created_at = datetime.fromisoformat(event['time'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return {
+            'provider_tx_id': tx_id,
+            'type': row['type'],
+            'amount': row['amount'],
+            'category': row['category'],
+            'description': row.get('description') or '',
+            'created_at': created_at,
+        }
+
+
+# (category, type, description choices, amount range) of the mock feed
+MOCK_MERCHANTS = (
+    ('groceries', 'expense', ('Silpo', 'ATB Market', 'Novus'), (4, 95)),
+    ('cafe', 'expense', ('Aroma Kava', 'Lviv Croissants', 'Starbucks'), (2, 15)),
+    ('transport', 'expense', ('Uklon', 'Bolt', 'Metro top-up'), (1, 25)),
+    ('fuel', 'expense', ('WOG', 'OKKO'), (20, 70)),
+    ('shopping', 'expense', ('Rozetka', 'Epicentr', 'Zara'), (10, 250)),
+    ('utilities', 'expense', ('Kyivstar', 'Yasno electricity'), (5, 60)),
+    ('entertainment', 'expense', ('Netflix', 'Multiplex', 'Spotify'), (5, 30)),
+)
+
+
+class MockBankProvider(BankProvider):
+    """Deterministic local feed: the same connection and day always yield the
+    same transactions (and ids), so re-syncs exercise deduplication without a
+    network. A salary lands on the 1st, plus 0-4 card payments a day."""
+    id = 'mockbank'
+    name = 'Mock Bank'
+    HISTORY_DAYS = 90
+
+    def __init__(self, clock=datetime.utcnow):
+        self._clock = clock
+
+    def day_rows(self, connection_id: str, day: date) -> list[dict]:
+        seed = hashlib.sha256(f'{connection_id}:{day.isoformat()}'.encode()).digest()
+        rng = random.Random(seed)
+        picks = []
+        if day.day == 1:
+            picks.append(('salary', 'income', ('Employer LLC',), (1800, 2600)))
+        picks.extend(rng.choice(MOCK_MERCHANTS) for _ in range(rng.randint(0, 4)))
+        rows = []
+        for n, (category, type_, merchants, (low, high)) in enumerate(picks):
+            rows.append({
+                'provider_tx_id': f'{day.isoformat()}-{n}',
+                'type': type_,
+                'amount': Decimal(rng.randint(low * 100, high * 100)) / 100,
+                'category': category,
+                'description': rng.choice(merchants),
+                'created_at': datetime.combine(day, time()) + timedelta(
+                    seconds=rng.randint(7 * 3600, 23 * 3600)
+                ),
+            })
+        return rows
+
+    def fetch(self, connection, watermark: str | None) -> FetchResult:
+        now = self._clock()
+        today = now.date()
+        # Re-read the watermark day itself: it was still in progress then
+        start = (
+            date.fromisoformat(watermark) if watermark
+            else today - timedelta(days=self.HISTORY_DAYS)
+        )
+        rows = []
+        day = start
+        while day <= today:
+            rows.extend(
+                r for r in self.day_rows(str(connection.id), day) if r['created_at'] <= now
+            )
+            day += timedelta(days=1)
+        return FetchResult(rows, today.isoformat())
+
+
+PROVIDERS: dict[str, BankProvider] = {
+    p.id: p for p in (
+        MockBankProvider(),
+        PushProvider('monobank', 'Monobank'),
+        PushProvider('privatbank', 'PrivatBank'),
+    )
+}
+
+
+def get_provider(provider_id: str) -> BankProvider | None:
+    return PROVIDERS.get(provider_id)
@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from .models import Transaction, Goal
-from decimal import Decimal
+from .models import Goal
+from .money import cents_of, from_cents
 from datetime import datetime, time as time_cls, date as date_cls
+from decimal import Decimal
 
 
 class TransactionSerializer(serializers.Serializer):
@@ -15,13 +16,10 @@ class TransactionSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
 
     def create(self, validated_data):
+        # Go through the service so rollups and caches follow the write
+        from .services import TransactionService
         user = self.context['request'].user
-        doc = Transaction(
-            user_id=user.id,
-            **validated_data,
-        )
-        doc.save()
-        return doc
+        return TransactionService.create_transaction(user.id, **validated_data)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -47,6 +45,16 @@ class TransactionSerializer(serializers.Serializer):
         return data
 
 
+class TransactionImportRowSerializer(TransactionSerializer):
+    """One bank statement row: TransactionSerializer rules plus its date."""
+    date = serializers.DateField(input_formats=['iso-8601', '%d.%m.%Y', '%Y%m%d'])
+
+
+def _goal_money(instance, cents_field: str, legacy_field: str) -> float:
+    cents = cents_of(instance, cents_field, legacy_field)
+    return from_cents(cents) if cents is not None else 0.0
+
+
 class GoalSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField(max_length=100)
@@ -57,9 +65,13 @@ class GoalSerializer(serializers.Serializer):
     current_amount = serializers.DecimalField(
         max_digits=12, decimal_places=2, required=False, min_value=0
     )
-    due_date = serializers.DateField(required=False)
+    # Stored as a datetime; rendered as a date in to_representation
+    due_date = serializers.DateField(required=False, write_only=True)
     description = serializers.CharField(allow_blank=True, required=False, max_length=255)
     image = serializers.CharField(allow_blank=True, required=False, max_length=255)
+    category = serializers.CharField(
+        max_length=150, required=False, allow_null=True, allow_blank=True
+    )
 
     def create(self, validated_data):
         user = self.context['request'].user
@@ -81,23 +93,29 @@ class GoalSerializer(serializers.Serializer):
         data.update({
             'id': str(instance.id),
             'title': instance.title,
-            'target_amount': (
-                float(instance.target_amount)
-                if instance.target_amount is not None else 0.0
-            ),
-            'current_amount': float(
-                getattr(instance, 'current_amount', Decimal('0'))
-            ),
+            # Prefer exact cents; documents not yet migrated only have floats
+            'target_amount': _goal_money(instance, 'target_cents', 'target_amount'),
+            'current_amount': _goal_money(instance, 'current_cents', 'current_amount'),
             'due_date': (
                 instance.due_date.date().isoformat()
                 if getattr(instance, 'due_date', None) else None
             ),
             'description': getattr(instance, 'description', ''),
             'image': getattr(instance, 'image', '/vercel.svg'),
+            'category': getattr(instance, 'category', None),
         })
         return data
 
 
+class GoalContributionSerializer(serializers.Serializer):
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'))
+
+
+class BudgetSerializer(serializers.Serializer):
+    category = serializers.CharField(max_length=150)
+    limit = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0)
+
+
 class BankProviderSerializer(serializers.Serializer):
     id = serializers.CharField()
     name = serializers.CharField()
@@ -128,6 +146,18 @@ class BankConnectionSerializer(serializers.Serializer):
         return data
 
 
+class BankSyncJobSerializer(serializers.Serializer):
+    id = serializers.CharField(read_only=True)
+    connectionId = serializers.CharField(source='connection_id')
+    status = serializers.CharField()
+    createdAt = serializers.DateTimeField(source='created_at')
+    startedAt = serializers.DateTimeField(source='started_at', allow_null=True)
+    finishedAt = serializers.DateTimeField(source='finished_at', allow_null=True)
+    fetched = serializers.IntegerField(allow_null=True)
+    created = serializers.IntegerField(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
 class BankSyncScheduleSerializer(serializers.Serializer):
     enabled = serializers.BooleanField()
     intervalHours = serializers.IntegerField(source='interval_hours')
@@ -4,14 +4,104 @@ This abstracts MongoEngine direct access away from views to improve testability
 and prepare for possible future storage changes.
 """
 from __future__ import annotations
-from typing import Iterable, Sequence
-from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta
 from decimal import Decimal
-from .models import Transaction, Goal
-from django.core.cache import cache
+import base64
+import json
+import logging
+import random
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from .models import (
+    BankConnection, BankSyncJob, BankSyncSchedule, Budget, Goal, MonthlyRollup, Transaction,
+)
+from . import providers, suggestions
+from .caching import data_version, get_or_compute, invalidate_user
+from .money import cents_expr, cents_of, from_cents, to_cents
+from django.conf import settings
+
+logger = logging.getLogger("app.transactions")
+
+
+def encode_cursor(created_at: datetime, obj_id) -> str:
+    """Build an opaque keyset cursor from the last row of a page."""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(obj_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, ObjectId]:
+    """Inverse of encode_cursor. Raises ValueError('invalid_cursor')."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise ValueError('invalid_cursor')
+
+
+# Accepted values for the list endpoint's ``count`` parameter.
+COUNT_MODES = ("exact", "estimated", "none")
+
+# Stored fields needed to build the API representation of a transaction.
+API_FIELDS = ("type", "amount", "amount_cents", "category", "description", "created_at")
+
+
+# Month bucket of a transaction; documents written before the denormalized
+# ``month`` field existed are bucketed on the fly.
+MONTH_EXPR = {
+    "$ifNull": ["$month", {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}}]
+}
 
 
 class TransactionService:
+    @staticmethod
+    def to_api_dict(doc: dict) -> dict:
+        """Map a raw Mongo document straight to the API transaction shape.
+
+        Mirrors TransactionSerializer.to_representation without building a
+        Document or running DRF field conversion.
+        """
+        created_at = doc.get("created_at")
+        cents = cents_of(doc)
+        return {
+            "id": str(doc["_id"]),
+            "type": doc.get("type"),
+            "amount": from_cents(cents) if cents is not None else 0.0,
+            "category": doc.get("category"),
+            "description": doc.get("description", ""),
+            "created_at": created_at.isoformat() if created_at else None,
+            # Frontend expects 'date' string
+            "date": created_at.date().isoformat() if created_at else None,
+        }
+
+    @staticmethod
+    def api_rows(qs, start: int = 0, stop: int | None = None) -> list[dict]:
+        """Slice ``qs`` as projected raw dicts and map them to the API shape."""
+        raw = qs.only(*API_FIELDS).as_pymongo()
+        if start or stop is not None:
+            raw = raw[start:stop]
+        return [TransactionService.to_api_dict(doc) for doc in raw]
+
+    @staticmethod
+    def iter_api_rows(qs, batch_size: int = 1000) -> Iterator[dict]:
+        """Stream every row of ``qs`` in the API shape.
+
+        Reads through one server-side cursor fetching ``batch_size`` documents
+        per round trip, so memory stays flat regardless of history size.
+        """
+        raw = qs.only(*API_FIELDS).as_pymongo().batch_size(batch_size)
+        for doc in raw:
+            yield TransactionService.to_api_dict(doc)
+
+    @staticmethod
+    def recent_api_rows(user_id: int, limit: int) -> list[dict]:
+        """Newest ``limit`` transactions of a user in the API shape."""
+        qs = Transaction.objects(user_id=user_id).order_by('-created_at')
+        return TransactionService.api_rows(qs, 0, limit)
+
     @staticmethod
     def list_user_transactions(
         user_id: int, limit: int | None = None
@@ -35,11 +125,14 @@ class TransactionService:
         type_: str | None = None,
         min_amount: Decimal | None = None,
         max_amount: Decimal | None = None,
+        search: str | None = None,
     ) -> Iterable[Transaction]:
         """Return filtered transactions ordered newest first.
 
         All filter arguments are optional. categories can be a sequence of
-        category strings. Amount filters are inclusive.
+        category strings. Amount filters are inclusive. ``search`` runs a
+        text search over description/category (user_text index) and orders
+        by relevance first, newest first among equal scores.
         """
         qs = Transaction.objects(user_id=user_id)
         if date_from:
@@ -50,11 +143,83 @@ class TransactionService:
             qs = qs.filter(category__in=list(categories))
         if type_:
             qs = qs.filter(type=type_)
+        if min_amount is not None or max_amount is not None:
+            qs = qs.filter(__raw__=TransactionService._amount_range(min_amount, max_amount))
+        if search:
+            qs = qs.search_text(search)
+            return qs.order_by('$text_score', '-created_at', '-id')
+        # _id breaks ties between rows sharing a timestamp so keyset cursors
+        # (see seek_after) never skip or repeat rows.
+        return qs.order_by('-created_at', '-id')
+
+    @staticmethod
+    def _amount_range(min_amount: Decimal | None, max_amount: Decimal | None) -> dict:
+        """Inclusive amount filter on integer cents.
+
+        While AMOUNT_LEGACY_FALLBACK is on, documents not yet migrated to
+        cents are matched on the legacy float field as well.
+        """
+        cents_range, legacy_range = {}, {}
         if min_amount is not None:
-            qs = qs.filter(amount__gte=min_amount)
+            cents_range["$gte"] = to_cents(min_amount)
+            legacy_range["$gte"] = float(min_amount)
         if max_amount is not None:
-            qs = qs.filter(amount__lte=max_amount)
-        return qs.order_by('-created_at')
+            cents_range["$lte"] = to_cents(max_amount)
+            legacy_range["$lte"] = float(max_amount)
+        if not settings.AMOUNT_LEGACY_FALLBACK:
+            return {"amount_cents": cents_range}
+        return {"$or": [
+            {"amount_cents": cents_range},
+            {"amount_cents": None, "amount": legacy_range},
+        ]}
+
+    @staticmethod
+    def seek_after(qs, cursor: str):
+        """Restrict an ordered queryset to rows strictly after ``cursor``.
+
+        Replaces skip()-based offsets: the predicate is a range on
+        (created_at, _id), so Mongo seeks straight into the index instead
+        of walking every earlier row.
+        """
+        created_at, obj_id = decode_cursor(cursor)
+        return qs.filter(__raw__={
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": obj_id}},
+            ]
+        })
+
+    @staticmethod
+    def page_with_total(
+        qs, *, start: int, limit: int, count_cap: int | None = None
+    ) -> tuple[list[dict], int]:
+        """Fetch one page (API dicts) and the matching row count.
+
+        With ``count_cap`` the page is a plain find and the count a
+        ``count_documents`` limited to that many rows: both can use the
+        index (an index-only COUNT_SCAN for the count), and callers get a
+        cheap lower bound instead of a full walk. Without it a single
+        ``$facet`` runs the page and the exact count in one trip.
+        """
+        if count_cap:
+            items = TransactionService.api_rows(qs, start, start + limit)
+            return items, qs.limit(count_cap).count(with_limit_and_skip=True)
+        pipeline = [{
+            "$facet": {
+                "items": [
+                    {"$skip": start},
+                    {"$limit": limit},
+                    {"$project": {f: 1 for f in API_FIELDS}},
+                ],
+                "total": [{"$count": "n"}],
+            }
+        }]
+        row = next(iter(qs.aggregate(pipeline)), None) or {}
+        items = [
+            TransactionService.to_api_dict(doc) for doc in row.get("items", [])
+        ]
+        total = row["total"][0]["n"] if row.get("total") else 0
+        return items, total
 
     @staticmethod
     def create_transaction(
@@ -74,50 +239,469 @@ class TransactionService:
             created_at=datetime.utcnow(),
         )
         tx.save()
+        TransactionService.apply_derived([tx.to_mongo()])
+        TransactionService.invalidate_user_cache(user_id)
         return tx
 
+    @staticmethod
+    def insert_documents(docs: Sequence[dict]) -> dict[int, int]:
+        """Unordered ``insert_many`` of prepared transaction documents.
+
+        Returns ``{index: error code}`` for the documents Mongo rejected
+        (11000 for duplicates); a failing document does not stop the rest.
+        """
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        failed: dict[int, int] = {}
+        try:
+            coll.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            failed = {
+                e['index']: e.get('code', 0)
+                for e in exc.details.get('writeErrors', [])
+            }
+        TransactionService.apply_derived(
+            [d for i, d in enumerate(docs) if i not in failed]
+        )
+        return failed
+
+    @staticmethod
+    def upsert_provider_documents(docs: Sequence[dict]) -> list[dict]:
+        """Idempotent insert of bank-synced documents in one ``bulk_write``.
+
+        Keyed on (bank_connection_id, provider_tx_id), the unique
+        ``connection_provider_tx`` index; documents already stored are left
+        untouched (booked transactions do not change). Returns the newly
+        inserted documents, which alone feed rollups, goals and suggestions.
+        """
+        if not docs:
+            return []
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        ops = [
+            UpdateOne(
+                {'bank_connection_id': d['bank_connection_id'],
+                 'provider_tx_id': d['provider_tx_id']},
+                {'$setOnInsert': d},
+                upsert=True,
+            )
+            for d in docs
+        ]
+        try:
+            upserted = coll.bulk_write(ops, ordered=False).upserted_ids
+        except BulkWriteError as exc:
+            # A concurrent sync won the race for some keys (11000): those
+            # documents exist now, which is all an upsert asks for.
+            if any(e.get('code') != 11000 for e in exc.details.get('writeErrors', [])):
+                raise
+            upserted = {u['index']: u['_id'] for u in exc.details.get('upserted', [])}
+        inserted = [docs[i] for i in sorted(upserted)]
+        TransactionService.apply_derived(inserted)
+        return inserted
+
+    @staticmethod
+    def bulk_create_transactions(
+        user_id: int, rows: Sequence[dict], *, chunk_size: int = 500
+    ) -> list[ObjectId | None]:
+        """Insert many transactions with unordered ``insert_many`` chunks.
+
+        ``rows`` hold validated serializer data. Returns, per input row, the
+        new ObjectId or None if Mongo rejected that document; a failing row
+        does not stop the rest of its chunk. The user's cached data is
+        invalidated once for the whole batch.
+        """
+        now = datetime.utcnow()
+        results: list[ObjectId | None] = []
+        try:
+            for offset in range(0, len(rows), chunk_size):
+                docs = [
+                    TransactionService.build_document(user_id, row, created_at=now)
+                    for row in rows[offset:offset + chunk_size]
+                ]
+                failed = TransactionService.insert_documents(docs)
+                results.extend(
+                    None if i in failed else doc['_id'] for i, doc in enumerate(docs)
+                )
+        finally:
+            # Earlier chunks are stored even if a later one raised
+            if any(results):
+                TransactionService.invalidate_user_cache(user_id)
+        return results
+
+    @staticmethod
+    def build_document(user_id: int, row: dict, *, created_at: datetime) -> dict:
+        """Raw Mongo document for one validated row, with its _id assigned."""
+        tx = Transaction(
+            user_id=user_id,
+            type=row['type'],
+            amount=row['amount'],
+            category=row['category'],
+            description=row.get('description') or "",
+            created_at=row.get('created_at') or created_at,
+            import_hash=row.get('import_hash'),
+            bank_connection_id=row.get('bank_connection_id'),
+            provider_tx_id=row.get('provider_tx_id'),
+        )
+        tx.clean()  # derived fields (cents, buckets); save() runs it via validate()
+        doc = tx.to_mongo()
+        doc['_id'] = ObjectId()
+        return doc
+
+    @staticmethod
+    def apply_derived(docs: Sequence[dict]) -> None:
+        """Fold stored transactions into rollups, linked goals and category
+        suggestions.
+
+        Each step is isolated and only logged on failure: the transactions
+        are already stored, so failing the request would make clients retry
+        and create duplicates. Drift is repaired by rebuild_rollups.
+        """
+        if not docs:
+            return
+        for step in (RollupService.apply, GoalService.apply_transactions, suggestions.record):
+            try:
+                step(docs)
+            except Exception:
+                logger.exception(
+                    "derived_write_failed",
+                    extra={"event": "derived_write_failed", "step": step.__qualname__},
+                )
+
+    @staticmethod
+    def invalidate_user_cache(user_id: int) -> None:
+        """Bump the user's data version after a write (cached summaries,
+        analytics and ETags all follow it). Best effort, see invalidate_user."""
+        invalidate_user(user_id)
+
     @staticmethod
     def user_summary(user_id: int) -> dict:
         """Return aggregated income/expense/net for a user.
 
-        Cached for 30 seconds to reduce aggregation cost.
+        Cached under the user's data version, so any transaction write is
+        visible immediately; see transaction.caching for stampede handling.
         """
-        cache_key = f"tx_summary:{user_id}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+        try:
+            cache_key = f"tx_summary:{user_id}:{data_version(user_id)}"
+        except Exception:  # cache backend down
+            return TransactionService._compute_summary(user_id)
+        return get_or_compute(
+            cache_key,
+            lambda: TransactionService._compute_summary(user_id),
+            timeout=settings.SUMMARY_CACHE_TTL,
+        )
+
+    @staticmethod
+    def _compute_summary(user_id: int) -> dict:
+        # Reads the monthly rollups, so cost scales with months, not rows
         pipeline = [
             {"$match": {"user_id": user_id}},
             {
                 "$group": {
                     "_id": "$type",
-                    "total": {"$sum": "$amount"},
+                    "cents": {"$sum": "$total_cents"},
                 }
             },
         ]
-        # Direct MongoEngine access to underlying collection
-        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        coll = MonthlyRollup._get_collection()  # pylint: disable=protected-access
         totals = {"income": 0, "expense": 0}
+        for row in coll.aggregate(pipeline):  # pragma: no branch - simple loop
+            t = row.get("_id")
+            if t in totals:
+                totals[t] = row.get("cents", 0)
+        # Integer cents all the way, converted once at the edge
+        return {
+            "totalIncome": from_cents(totals["income"]),
+            "totalExpense": from_cents(totals["expense"]),
+            "net": from_cents(totals["income"] - totals["expense"]),
+        }
+
+
+class RollupService:
+    """Maintains MonthlyRollup documents from transaction writes."""
+
+    @staticmethod
+    def month_key(dt: datetime) -> str:
+        return dt.strftime("%Y-%m")
+
+    @staticmethod
+    def _doc_month(doc: dict) -> str:
+        return doc.get("month") or RollupService.month_key(doc["created_at"])
+
+    @staticmethod
+    def apply(docs: Iterable[dict]) -> None:
+        """Fold freshly inserted raw transaction documents into the rollups.
+
+        Deltas are merged per (user, month, category, type) first, so a bulk
+        insert costs one ``$inc`` upsert per distinct key in a single
+        bulk_write round trip.
+        """
+        deltas: dict[tuple, list] = {}
+        for doc in docs:
+            key = (
+                doc["user_id"],
+                RollupService._doc_month(doc),
+                doc["category"],
+                doc["type"],
+            )
+            delta = deltas.setdefault(key, [0, 0])
+            delta[0] += cents_of(doc)
+            delta[1] += 1
+        if not deltas:
+            return
+        ops = [
+            UpdateOne(
+                {"user_id": u, "month": m, "category": c, "type": t},
+                {"$inc": {"total_cents": total, "count": count}},
+                upsert=True,
+            )
+            for (u, m, c, t), (total, count) in deltas.items()
+        ]
+        coll = MonthlyRollup._get_collection()  # pylint: disable=protected-access
+        coll.bulk_write(ops, ordered=False)
+
+    @staticmethod
+    def rebuild_user(user_id: int) -> int:
+        """Recompute one user's rollups from raw transactions.
+
+        Safe next to live writes: only counters that differ from the
+        aggregate are overwritten (``$set`` upserts per key), and only keys
+        that existed before the aggregation and are absent from it are
+        deleted, so readers never see a user's rollups vanish. A write that
+        lands between the aggregation and the ``$set`` of its own key can
+        still be overwritten; rerun to converge. Returns the number of
+        rollup documents changed.
+        """
+        coll = MonthlyRollup._get_collection()  # pylint: disable=protected-access
+        existing = {
+            (d["month"], d["category"], d["type"]): d
+            for d in coll.find(
+                {"user_id": user_id},
+                {"month": 1, "category": 1, "type": 1, "total_cents": 1, "count": 1},
+            )
+        }
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {
+                "$group": {
+                    "_id": {
+                        "month": MONTH_EXPR,
+                        "category": "$category",
+                        "type": "$type",
+                    },
+                    "cents": {"$sum": cents_expr()},
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        tx_coll = Transaction._get_collection()  # pylint: disable=protected-access
+        ops = []
+        fresh = set()
+        for row in tx_coll.aggregate(pipeline, allowDiskUse=True):
+            key = (row["_id"]["month"], row["_id"]["category"], row["_id"]["type"])
+            fresh.add(key)
+            current = existing.get(key) or {}
+            if (
+                current.get("total_cents") == row["cents"]
+                and current.get("count") == row["count"]
+            ):
+                continue
+            month, category, type_ = key
+            ops.append(UpdateOne(
+                {"user_id": user_id, "month": month, "category": category, "type": type_},
+                {"$set": {"total_cents": row["cents"], "count": row["count"]}},
+                upsert=True,
+            ))
+        stale = [d["_id"] for key, d in existing.items() if key not in fresh]
+        if ops:
+            coll.bulk_write(ops, ordered=False)
+        if stale:
+            coll.delete_many({"_id": {"$in": stale}})
+        return len(ops) + len(stale)
+
+    @staticmethod
+    def user_ids() -> list[int]:
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        return coll.distinct("user_id")
+
+
+class AnalyticsService:
+    """Category / month breakdowns for the analytics endpoint."""
+
+    @staticmethod
+    def breakdown(
+        user_id: int,
+        *,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        top: int = 5,
+    ) -> dict:
+        """Cached breakdown of a user's transactions within a date range."""
+        def compute():
+            return AnalyticsService._compute(user_id, date_from, date_to, top)
+
         try:
-            for row in coll.aggregate(pipeline):  # pragma: no branch - simple loop
-                t = row.get("_id")
-                if t in totals:
-                    totals[t] = float(row.get("total", 0))
-        except Exception:  # pragma: no cover - defensive
-            pass
-        result = {
-            "totalIncome": totals["income"],
-            "totalExpense": totals["expense"],
-            "net": totals["income"] - totals["expense"],
+            version = data_version(user_id)
+        except Exception:  # cache backend down
+            return compute()
+        key = "tx_analytics:{}:{}:{}:{}:{}".format(
+            user_id,
+            version,
+            date_from.isoformat() if date_from else "",
+            date_to.isoformat() if date_to else "",
+            top,
+        )
+        return get_or_compute(key, compute, timeout=settings.ANALYTICS_CACHE_TTL)
+
+    @staticmethod
+    def _month_aligned(date_from: datetime | None, date_to: datetime | None) -> bool:
+        """True when the range covers whole months: it starts at midnight on
+        a 1st and ends on the last second (23:59:59) of a month."""
+        def month_start(dt: datetime) -> bool:
+            return dt.day == 1 and dt.time() == datetime.min.time()
+
+        if date_from and not month_start(date_from):
+            return False
+        if date_to and not month_start(date_to + timedelta(seconds=1)):
+            return False
+        return True
+
+    @staticmethod
+    def _rows(user_id: int, date_from, date_to) -> list[tuple[str, str, str, int, int]]:
+        """(month, category, type, cents, count) rows for the range.
+
+        Whole-month ranges are answered from MonthlyRollup; anything else
+        runs one $group over transactions, matched on user_created_amount.
+        """
+        if AnalyticsService._month_aligned(date_from, date_to):
+            query: dict = {"user_id": user_id}
+            months = {}
+            if date_from:
+                months["$gte"] = RollupService.month_key(date_from)
+            if date_to:
+                months["$lte"] = RollupService.month_key(date_to)
+            if months:
+                query["month"] = months
+            coll = MonthlyRollup._get_collection()  # pylint: disable=protected-access
+            return [
+                (r["month"], r["category"], r["type"], r.get("total_cents", 0), r["count"])
+                for r in coll.find(query, {"_id": 0, "user_id": 0})
+            ]
+        match: dict = {"user_id": user_id}
+        created = {}
+        if date_from:
+            created["$gte"] = date_from
+        if date_to:
+            created["$lte"] = date_to
+        if created:
+            match["created_at"] = created
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {
+                        "month": MONTH_EXPR,
+                        "category": "$category",
+                        "type": "$type",
+                    },
+                    "cents": {"$sum": cents_expr()},
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        coll = Transaction._get_collection()  # pylint: disable=protected-access
+        return [
+            (
+                r["_id"]["month"], r["_id"]["category"], r["_id"]["type"],
+                r["cents"], r["count"],
+            )
+            for r in coll.aggregate(pipeline)
+        ]
+
+    @staticmethod
+    def _compute(user_id: int, date_from, date_to, top: int) -> dict:
+        # (month, category, type) is the finest grain; the coarser views are
+        # folded from it here, over at most months x categories rows. Sums
+        # stay in integer cents until the response is built.
+        rows = AnalyticsService._rows(user_id, date_from, date_to)
+        totals = {"income": 0, "expense": 0}
+        by_category: dict[str, dict] = {}
+        by_month: dict[str, dict] = {}
+        by_month_category = []
+        expense_counts: dict[str, int] = {}
+        for month, category, type_, cents, count in rows:
+            if type_ not in totals:
+                continue
+            totals[type_] += cents
+            if type_ == "expense":
+                expense_counts[category] = expense_counts.get(category, 0) + count
+            cat = by_category.setdefault(
+                category, {"category": category, "income": 0, "expense": 0, "count": 0}
+            )
+            cat[type_] += cents
+            cat["count"] += count
+            mon = by_month.setdefault(
+                month, {"month": month, "income": 0, "expense": 0, "count": 0}
+            )
+            mon[type_] += cents
+            mon["count"] += count
+            by_month_category.append({
+                "month": month,
+                "category": category,
+                "type": type_,
+                "total": cents,
+                "count": count,
+            })
+
+        categories = sorted(
+            by_category.values(),
+            key=lambda c: (-c["expense"], -c["income"], c["category"]),
+        )
+        top_categories = [
+            {
+                "category": c["category"],
+                "total": from_cents(c["expense"]),
+                "count": expense_counts[c["category"]],
+            }
+            for c in categories[:top] if c["expense"] > 0
+        ]
+        months = []
+        for m in sorted(by_month):
+            entry = by_month[m]
+            entry["net"] = entry["income"] - entry["expense"]
+            months.append(entry)
+        by_month_category.sort(key=lambda r: (r["month"], r["type"], -r["total"], r["category"]))
+        for entry in (*categories, *months):
+            for field in ("income", "expense", "net"):
+                if field in entry:
+                    entry[field] = from_cents(entry[field])
+        for entry in by_month_category:
+            entry["total"] = from_cents(entry["total"])
+        return {
+            "totals": {
+                "income": from_cents(totals["income"]),
+                "expense": from_cents(totals["expense"]),
+                "net": from_cents(totals["income"] - totals["expense"]),
+            },
+            "by_category": categories,
+            "by_month": months,
+            "by_month_category": by_month_category,
+            "top_categories": top_categories,
         }
-        cache.set(cache_key, result, timeout=30)
-        return result
 
 
 class GoalService:
+    # Fields GoalSerializer reads; the list loads nothing else
+    LIST_FIELDS = (
+        "title", "target_amount", "current_amount", "target_cents",
+        "current_cents", "due_date", "description", "image", "category",
+    )
+
     @staticmethod
     def list_user_goals(user_id: int) -> Iterable[Goal]:
-        return Goal.objects(user_id=user_id)
+        """A user's goals, latest due date first (user_due_desc index)."""
+        return (
+            Goal.objects(user_id=user_id)
+            .order_by("-due_date")
+            .only(*GoalService.LIST_FIELDS)
+        )
 
     @staticmethod
     def create_goal(
@@ -129,6 +713,7 @@ class GoalService:
         due_date=None,
         description: str = "",
         image: str = "/vercel.svg",
+        category: str | None = None,
     ) -> Goal:
         goal = Goal(
             user_id=user_id,
@@ -138,6 +723,399 @@ class GoalService:
             due_date=due_date,
             description=description or "",
             image=image or "/vercel.svg",
+            category=category or None,
         )
         goal.save()
+        invalidate_user(user_id)
         return goal
+
+    @staticmethod
+    def _progress_inc(cents: int) -> list[dict]:
+        """Update pipeline adding ``cents`` to a goal's progress. Goals saved
+        before cents storage have no current_cents; it is seeded from the
+        legacy current_amount instead of starting from the contribution."""
+        current = {"$ifNull": [cents_expr("current_cents", "current_amount"), 0]}
+        return [
+            {"$set": {"current_cents": {"$add": [current, cents]}}},
+            # The legacy float mirrors the cents so old readers stay close
+            {"$set": {"current_amount": {"$divide": ["$current_cents", 100]}}},
+        ]
+
+    @staticmethod
+    def apply_transactions(docs: Iterable[dict]) -> None:
+        """Add freshly inserted transactions to the progress of goals linked
+        to their category, one update per (user, category) in a single
+        bulk_write. Progress is never recomputed from transactions.
+
+        An expense in the linked category is money set aside for the goal and
+        adds to it; an income there is money taken back out and subtracts.
+        """
+        deltas: dict[tuple, int] = {}
+        for doc in docs:
+            key = (doc["user_id"], doc["category"])
+            cents = cents_of(doc) or 0
+            deltas[key] = deltas.get(key, 0) + (-cents if doc["type"] == "income" else cents)
+        ops = [
+            UpdateMany(
+                {"user_id": user_id, "category": category},
+                GoalService._progress_inc(cents),
+            )
+            for (user_id, category), cents in deltas.items()
+            if cents
+        ]
+        if ops:
+            coll = Goal._get_collection()  # pylint: disable=protected-access
+            coll.bulk_write(ops, ordered=False)
+
+    @staticmethod
+    def contribute(user_id: int, goal_id: str, amount) -> Goal | None:
+        """Atomically add ``amount`` to a goal's progress. None if the goal
+        does not exist or belongs to someone else."""
+        try:
+            oid = ObjectId(goal_id)
+        except (InvalidId, TypeError):
+            return None
+        coll = Goal._get_collection()  # pylint: disable=protected-access
+        doc = coll.find_one_and_update(
+            {"_id": oid, "user_id": user_id},
+            GoalService._progress_inc(to_cents(amount)),
+            projection=("_id",) + GoalService.LIST_FIELDS,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return None
+        invalidate_user(user_id)
+        return Goal._from_son(doc)  # pylint: disable=protected-access
+
+
+class BudgetService:
+    @staticmethod
+    def set_budget(user_id: int, *, category: str, limit) -> Budget:
+        """Create or replace the monthly limit of ``category``."""
+        coll = Budget._get_collection()  # pylint: disable=protected-access
+        doc = coll.find_one_and_update(
+            {"user_id": user_id, "category": category},
+            {"$set": {"limit_cents": to_cents(limit), "updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        invalidate_user(user_id)
+        return Budget._from_son(doc)  # pylint: disable=protected-access
+
+    @staticmethod
+    def delete_budget(user_id: int, category: str) -> bool:
+        deleted = Budget.objects(user_id=user_id, category=category).delete()
+        if deleted:
+            invalidate_user(user_id)
+        return bool(deleted)
+
+    @staticmethod
+    def spent(user_id: int, month: str, categories: Sequence[str]) -> dict[str, int]:
+        """Expense cents per category in ``month``. Reads the rollups, which
+        every transaction insert ``$inc``s: one indexed point lookup per
+        category (user_month_category_type), never an aggregation."""
+        rows = MonthlyRollup.objects(
+            user_id=user_id, month=month, category__in=list(categories), type="expense"
+        ).only("category", "total_cents").as_pymongo()
+        return {row["category"]: row.get("total_cents", 0) for row in rows}
+
+    @staticmethod
+    def user_budgets(user_id: int, month: str) -> list[dict]:
+        """Every budget of the user with its spend in ``month``."""
+        budgets = list(
+            Budget.objects(user_id=user_id).order_by("category")
+            .only("category", "limit_cents").as_pymongo()
+        )
+        spent = BudgetService.spent(user_id, month, [b["category"] for b in budgets])
+        return [
+            BudgetService.status(b, spent.get(b["category"], 0), month) for b in budgets
+        ]
+
+    @staticmethod
+    def status(budget: dict, spent_cents: int, month: str) -> dict:
+        limit = budget["limit_cents"]
+        return {
+            "category": budget["category"],
+            "month": month,
+            "limit": from_cents(limit),
+            "spent": from_cents(spent_cents),
+            "remaining": from_cents(limit - spent_cents),
+            "over_budget": spent_cents > limit,
+        }
+
+    @staticmethod
+    def user_ids() -> list[int]:
+        coll = Budget._get_collection()  # pylint: disable=protected-access
+        return sorted(coll.distinct("user_id"))
+
+
+class BankSyncService:
+    # A run lands up to this fraction of its interval late, so schedules
+    # created together drift apart instead of coming due in the same second.
+    JITTER_FRACTION = 0.1
+    # Accepted schedule intervals; next_run_at clamps stored values into it
+    MIN_INTERVAL_HOURS = 1
+    MAX_INTERVAL_HOURS = 168
+
+    @staticmethod
+    def next_run_at(interval_hours: int, now: datetime | None = None) -> datetime:
+        # Never in the past: a bad stored interval must not make the worker
+        # re-claim the schedule in a tight loop
+        interval_hours = min(
+            max(interval_hours, BankSyncService.MIN_INTERVAL_HOURS),
+            BankSyncService.MAX_INTERVAL_HOURS,
+        )
+        interval = timedelta(hours=interval_hours)
+        jitter = interval * random.uniform(0, BankSyncService.JITTER_FRACTION)
+        return (now or datetime.utcnow()) + interval + jitter
+
+    @staticmethod
+    def claim_due(worker_id: str, limit: int, *, now: datetime | None = None) -> list[dict]:
+        """Lease up to ``limit`` due schedules, most overdue first.
+
+        Each claim is one atomic find-and-modify, so concurrent workers never
+        get the same schedule. A lease runs out after BANK_SYNC_LEASE_SECONDS;
+        schedules of a crashed worker become claimable again then.
+        """
+        now = now or datetime.utcnow()
+        lease_until = now + timedelta(seconds=settings.BANK_SYNC_LEASE_SECONDS)
+        coll = BankSyncSchedule._get_collection()  # pylint: disable=protected-access
+        claimed = []
+        for _ in range(limit):
+            doc = coll.find_one_and_update(
+                {
+                    "enabled": 1,
+                    "next_run_at": {"$lte": now},
+                    "$or": [{"lease_until": None}, {"lease_until": {"$lte": now}}],
+                },
+                {"$set": {"lease_until": lease_until, "leased_by": worker_id}},
+                sort=[("next_run_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+            claimed.append(doc)
+        return claimed
+
+    @staticmethod
+    def sync_connection(conn: BankConnection) -> dict:
+        """Fetch from the connection's provider since its watermark and upsert.
+
+        Provider feeds may overlap the previous sync; the upsert drops what is
+        already stored, so re-running a sync never duplicates transactions.
+        Returns ``{"fetched": n, "created": n}``.
+        """
+        provider = providers.get_provider(conn.provider_id)
+        if provider is None:
+            raise ValueError(f"unknown provider {conn.provider_id!r}")
+        result = provider.fetch(conn, conn.sync_watermark)
+        now = datetime.utcnow()
+        docs = [
+            TransactionService.build_document(
+                conn.user_id, {**row, "bank_connection_id": str(conn.id)}, created_at=now
+            )
+            for row in result.rows
+        ]
+        inserted = TransactionService.upsert_provider_documents(docs)
+        # Only advanced once the batch is stored: a failed sync refetches.
+        # A connection the user disconnected meanwhile stays disconnected.
+        BankConnection.objects(id=conn.id, status__ne="disconnected").update_one(
+            set__sync_watermark=result.watermark,
+            set__last_synced_at=now,
+            set__status="connected",
+        )
+        invalidate_user(conn.user_id)
+        return {"fetched": len(docs), "created": len(inserted)}
+
+    @staticmethod
+    def sync_user(user_id: int) -> int:
+        """Sync the user's connected bank connections; returns how many."""
+        conns = list(BankConnection.objects(user_id=user_id, status="connected"))
+        for conn in conns:
+            BankSyncService.sync_connection(conn)
+        return len(conns)
+
+    @staticmethod
+    def complete(
+        schedule: dict, worker_id: str, *, error: str | None = None,
+        now: datetime | None = None,
+    ) -> bool:
+        """Release a lease and schedule the next run (with jitter).
+
+        Returns False if the lease expired and another worker took the
+        schedule over; that worker then owns the next run.
+        """
+        now = now or datetime.utcnow()
+        coll = BankSyncSchedule._get_collection()  # pylint: disable=protected-access
+        result = coll.update_one(
+            {
+                "_id": schedule["_id"],
+                "leased_by": worker_id,
+                "lease_until": schedule["lease_until"],
+            },
+            {"$set": {
+                "lease_until": None,
+                "leased_by": None,
+                "last_run_at": now,
+                "last_error": error,
+                "next_run_at": BankSyncService.next_run_at(
+                    schedule.get("interval_hours") or 2, now
+                ),
+            }},
+        )
+        return result.modified_count == 1
+
+
+class BankSyncJobService:
+    """Sync-now requests as a Mongo-backed queue (``bank_sync_jobs``).
+
+    The API enqueues and returns at once; bank_sync_worker claims queued jobs
+    under a lease, like schedules, and records the outcome on the job.
+    """
+
+    @staticmethod
+    def enqueue(conn: BankConnection) -> tuple[dict, bool]:
+        """Queue a sync of ``conn`` unless one is already queued or running.
+
+        Returns ``(job, created)``; with an active job that job is returned
+        and nothing is queued. The partial unique index on active jobs makes
+        this hold under concurrent requests too.
+        """
+        coll = BankSyncJob._get_collection()  # pylint: disable=protected-access
+        new_id = ObjectId()
+        for _ in range(2):
+            try:
+                doc = coll.find_one_and_update(
+                    {"connection_id": str(conn.id), "active": True},
+                    {"$setOnInsert": {
+                        "_id": new_id,
+                        "user_id": conn.user_id,
+                        "status": "queued",
+                        "created_at": datetime.utcnow(),
+                    }},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return doc, doc["_id"] == new_id
+            except DuplicateKeyError:
+                continue  # a concurrent request inserted it; the retry finds it
+        raise RuntimeError("could not enqueue bank sync job")
+
+    @staticmethod
+    def get(user_id: int, job_id: str) -> BankSyncJob | None:
+        try:
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            return None
+        return BankSyncJob.objects(id=oid, user_id=user_id).first()
+
+    @staticmethod
+    def claim(worker_id: str, limit: int, *, now: datetime | None = None) -> list[dict]:
+        """Lease up to ``limit`` queued jobs, oldest first. Running jobs whose
+        lease ran out (crashed worker) are claimed again."""
+        now = now or datetime.utcnow()
+        lease_until = now + timedelta(seconds=settings.BANK_SYNC_LEASE_SECONDS)
+        coll = BankSyncJob._get_collection()  # pylint: disable=protected-access
+        claimed = []
+        for _ in range(limit):
+            doc = coll.find_one_and_update(
+                {"$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_until": {"$lte": now}},
+                ]},
+                {"$set": {
+                    "status": "running",
+                    "started_at": now,
+                    "lease_until": lease_until,
+                    "leased_by": worker_id,
+                }},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+            claimed.append(doc)
+        return claimed
+
+    @staticmethod
+    def run(job: dict) -> dict:
+        """Sync the job's connection; raises if it is gone or disconnected."""
+        conn = BankConnection.objects(
+            id=job["connection_id"], user_id=job["user_id"]
+        ).first()
+        if conn is None or conn.status == "disconnected":
+            raise LookupError("bank connection not found or disconnected")
+        return BankSyncService.sync_connection(conn)
+
+    @staticmethod
+    def finish(
+        job: dict, worker_id: str, *, result: dict | None = None,
+        error: str | None = None, now: datetime | None = None,
+    ) -> bool:
+        """Record the outcome and release the connection for new jobs.
+        False if the lease was lost to another worker."""
+        coll = BankSyncJob._get_collection()  # pylint: disable=protected-access
+        update = coll.update_one(
+            {"_id": job["_id"], "leased_by": worker_id, "lease_until": job["lease_until"]},
+            {"$set": {
+                "status": "failed" if error else "done",
+                "active": False,
+                "finished_at": now or datetime.utcnow(),
+                "lease_until": None,
+                "leased_by": None,
+                "fetched": (result or {}).get("fetched"),
+                "created": (result or {}).get("created"),
+                "error": error,
+            }},
+        )
+        return update.modified_count == 1
+
+
+class BankWebhookService:
+    @staticmethod
+    def ingest(batches: Sequence[dict]) -> dict:
+        """Apply buffered webhook deliveries (see transaction.webhooks).
+
+        Events are grouped by connection, checked against it (it must exist,
+        not be disconnected and belong to the delivering provider) and
+        upserted in one bulk write. Touched connections get one
+        ``last_synced_at`` update and each affected user one invalidation.
+        Returns ``{"events", "created", "skipped"}``.
+        """
+        grouped: dict[str, list[tuple[str, dict]]] = {}
+        total = 0
+        for batch in batches:
+            for event in batch.get("events") or []:
+                total += 1
+                if isinstance(event, dict):
+                    key = str(event.get("connectionId") or "")
+                    grouped.setdefault(key, []).append((batch.get("provider"), event))
+        ids = [ObjectId(cid) for cid in grouped if ObjectId.is_valid(cid)]
+        conns = {
+            str(c.id): c
+            for c in BankConnection.objects(id__in=ids, status__ne="disconnected")
+            .only("id", "user_id", "provider_id")
+        } if ids else {}
+
+        now = datetime.utcnow()
+        docs = []
+        for cid, events in grouped.items():
+            conn = conns.get(cid)
+            provider = providers.get_provider(conn.provider_id) if conn else None
+            if not isinstance(provider, providers.PushProvider):
+                continue
+            for provider_id, event in events:
+                row = provider.parse_event(event) if provider_id == provider.id else None
+                if row is not None:
+                    docs.append(TransactionService.build_document(
+                        conn.user_id, {**row, "bank_connection_id": cid}, created_at=now
+                    ))
+        inserted = TransactionService.upsert_provider_documents(docs)
+        touched = {d["bank_connection_id"] for d in docs}
+        if touched:
+            BankConnection.objects(id__in=[ObjectId(cid) for cid in touched]).update(
+                set__last_synced_at=now
+            )
+            for user_id in {d["user_id"] for d in docs}:
+                invalidate_user(user_id)
+        return {"events": total, "created": len(inserted), "skipped": total - len(docs)}
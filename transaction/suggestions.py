@@ -0,0 +1,200 @@
+"""Per-user category suggestions ranked by frequency and recency.
+
+Each use of a category adds ``2 ** (age / HALF_LIFE)`` to its score, counted
+from a fixed epoch, so recent uses outweigh old ones without ever rescoring
+stored entries. Scores live in a Redis hash per user when the cache is Redis
+(otherwise in process) and every transaction write increments them atomically
+(HINCRBYFLOAT / HINCRBY), so concurrent writers never lose each other's
+updates. A missing hash is rebuilt from the monthly rollups, never from the
+transactions collection.
+
+Reads go through a small in-process LRU of prefix-sorted indexes keyed by the
+user's data version, so a lookup costs one version read plus a bisect.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable
+import calendar
+import heapq
+import threading
+
+from django.conf import settings
+
+from .caching import data_version
+from .models import MonthlyRollup
+
+EPOCH = calendar.timegm((2020, 1, 1, 0, 0, 0))
+HALF_LIFE = 30 * 86400  # seconds for a use to lose half of its weight
+LRU_SIZE = 1024  # users whose index is kept in process
+
+_lru: OrderedDict[int, tuple[int, list[str], list[tuple]]] = OrderedDict()
+_lru_lock = threading.Lock()
+
+# Increment only an existing hash: one evicted meanwhile must be rebuilt
+# from the rollups, not restarted from the few documents of this write.
+INCREMENT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV, 3 do
+  redis.call('HINCRBYFLOAT', KEYS[1], 's:' .. ARGV[i], ARGV[i + 1])
+  redis.call('HINCRBY', KEYS[1], 'n:' .. ARGV[i], ARGV[i + 2])
+end
+return 1
+"""
+BUILT_FIELD = 'built'  # marks the hash of a user without any category
+
+
+class LocalScores:
+    def __init__(self):
+        self._stats: dict[int, dict[str, list]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> dict[str, list] | None:
+        with self._lock:
+            stats = self._stats.get(user_id)
+            return None if stats is None else {c: list(e) for c, e in stats.items()}
+
+    def replace(self, user_id: int, stats: dict[str, list]) -> None:
+        with self._lock:
+            self._stats[user_id] = {c: list(e) for c, e in stats.items()}
+
+    def add(self, user_id: int, deltas: dict[str, list]) -> bool:
+        with self._lock:
+            stats = self._stats.get(user_id)
+            if stats is None:
+                return False
+            for category, (score, count) in deltas.items():
+                entry = stats.setdefault(category, [0.0, 0])
+                entry[0] += score
+                entry[1] += count
+            return True
+
+
+class RedisScores:
+    """``s:<category>`` (score) and ``n:<category>`` (count) per user hash."""
+
+    def __init__(self, prefix: str | None):
+        from django_redis import get_redis_connection
+
+        self._redis = get_redis_connection('default')
+        self._prefix = f'{prefix}:' if prefix else ''
+        self._increment = self._redis.register_script(INCREMENT_SCRIPT)
+
+    def _key(self, user_id: int) -> str:
+        return f"{self._prefix}category_index:{user_id}"
+
+    def get(self, user_id: int) -> dict[str, list] | None:
+        raw = self._redis.hgetall(self._key(user_id))
+        if not raw:
+            return None
+        stats: dict[str, list] = {}
+        for field, value in raw.items():
+            kind, _, category = field.decode().partition(':')
+            if kind == 's':
+                stats.setdefault(category, [0.0, 0])[0] = float(value)
+            elif kind == 'n':
+                stats.setdefault(category, [0.0, 0])[1] = int(value)
+        return stats
+
+    def replace(self, user_id: int, stats: dict[str, list]) -> None:
+        mapping: dict[str, float | int] = {BUILT_FIELD: 1}
+        for category, (score, count) in stats.items():
+            mapping[f's:{category}'] = score
+            mapping[f'n:{category}'] = count
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(self._key(user_id))
+        pipe.hset(self._key(user_id), mapping=mapping)
+        pipe.execute()
+
+    def add(self, user_id: int, deltas: dict[str, list]) -> bool:
+        args: list = []
+        for category, (score, count) in deltas.items():
+            args.extend((category, repr(score), count))
+        return bool(self._increment(keys=[self._key(user_id)], args=args))
+
+
+_store: LocalScores | RedisScores | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> LocalScores | RedisScores:
+    global _store
+    with _store_lock:
+        if _store is None:
+            cache = settings.CACHES['default']
+            if cache['BACKEND'].startswith('django_redis.'):
+                _store = RedisScores(cache.get('KEY_PREFIX'))
+            else:
+                _store = LocalScores()
+        return _store
+
+
+def _weight(dt: datetime) -> float:
+    return 2 ** ((calendar.timegm(dt.utctimetuple()) - EPOCH) / HALF_LIFE)
+
+
+def _rebuild(user_id: int) -> dict[str, list]:
+    """Scores from the user's rollups; months count from their first day."""
+    stats: dict[str, list] = {}
+    rows = MonthlyRollup.objects(user_id=user_id).only(
+        'month', 'category', 'count'
+    ).as_pymongo()
+    for row in rows:
+        weight = _weight(datetime.strptime(row['month'], '%Y-%m'))
+        entry = stats.setdefault(row['category'], [0.0, 0])
+        entry[0] += weight * row.get('count', 0)
+        entry[1] += row.get('count', 0)
+    get_store().replace(user_id, stats)
+    return stats
+
+
+def record(docs: Iterable[dict]) -> None:
+    """Count freshly inserted raw transaction documents.
+
+    Call after the rollups were applied: a user without a stored index gets
+    it rebuilt from them, which already includes ``docs``.
+    """
+    by_user: dict[int, dict[str, list]] = {}
+    for doc in docs:
+        deltas = by_user.setdefault(doc['user_id'], {})
+        entry = deltas.setdefault(doc['category'], [0.0, 0])
+        entry[0] += _weight(doc['created_at'])
+        entry[1] += 1
+    store = get_store()
+    for user_id, deltas in by_user.items():
+        if not store.add(user_id, deltas):
+            _rebuild(user_id)
+
+
+def _index(user_id: int) -> tuple[list[str], list[tuple]]:
+    version = data_version(user_id)
+    with _lru_lock:
+        cached = _lru.get(user_id)
+        if cached is not None and cached[0] == version:
+            _lru.move_to_end(user_id)
+            return cached[1], cached[2]
+    stats = get_store().get(user_id)
+    if stats is None:
+        stats = _rebuild(user_id)
+    entries = sorted(
+        (category.casefold(), category, score, count)
+        for category, (score, count) in stats.items()
+    )
+    keys = [e[0] for e in entries]
+    with _lru_lock:
+        _lru[user_id] = (version, keys, entries)
+        _lru.move_to_end(user_id)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+    return keys, entries
+
+
+def suggest(user_id: int, prefix: str = '', limit: int = 10) -> list[dict]:
+    """Categories starting with ``prefix`` (case-insensitive), best first."""
+    keys, entries = _index(user_id)
+    prefix = prefix.casefold()
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix + '\U0010ffff')
+    best = heapq.nlargest(limit, entries[lo:hi], key=lambda e: e[2])
+    return [{'category': e[1], 'count': e[3]} for e in best]
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from transaction import ai_client
+from transaction.services import TransactionService
+
+
+@pytest.fixture
+def client(db, settings):
+    settings.AI_FEATURES_ENABLED = True
+    get_user_model().objects.create_user(username='ai1', password='p1', email='ai1@example.com')
+    api = APIClient()
+    token = api.post('/api/token/', {'username': 'ai1', 'password': 'p1'}, format='json')
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {token.data['access']}")
+    return api
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    calls = []
+    state = {'handler': lambda request: httpx.Response(200, json={'advice': 'ok'})}
+
+    def handler(request):
+        calls.append(request)
+        return state['handler'](request)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        ai_client, '_new_client',
+        lambda: httpx.AsyncClient(transport=transport, base_url='http://ai'),
+    )
+    monkeypatch.setattr(TransactionService, 'recent_api_rows', staticmethod(
+        lambda user_id, limit: [{
+            'id': 'x', 'type': 'expense', 'amount': 5.0, 'category': 'cafe',
+            'description': '', 'created_at': '2025-01-01T00:00:00Z',
+        }]
+    ))
+    return calls, state
+
+
+def test_advice_get_and_post_send_the_same_payload(client, ai_service):
+    calls, _ = ai_service
+    r_get = client.get('/api/ai/advice/')
+    r_post = client.post('/api/ai/advice/', {'prompt': 'save more?'}, format='json')
+
+    assert r_get.status_code == r_post.status_code == 200
+    assert r_post.json() == {'advice': 'ok'}
+    sent = [json.loads(c.content) for c in calls]
+    assert [c.url.path for c in calls] == ['/advice', '/advice']
+    assert sent[0]['transactions'] == sent[1]['transactions']
+    assert sent[0]['transactions'][0] == {
+        'type': 'expense', 'amount': 5.0, 'category': 'cafe',
+        'description': '', 'created_at': '2025-01-01T00:00:00Z',
+    }
+    assert (sent[0]['prompt'], sent[1]['prompt']) == ('', 'save more?')
+
+
+def test_ai_errors_map_to_details(client, ai_service, settings):
+    _, state = ai_service
+    state['handler'] = lambda request: httpx.Response(500)
+    assert client.get('/api/ai/advice/').json() == {'detail': 'ai_error'}
+
+    def busy(request):
+        raise httpx.PoolTimeout('pool exhausted')
+
+    state['handler'] = busy
+    r = client.get('/api/ai/advice/')
+    assert r.status_code == 503 and r.json() == {'detail': 'ai_busy'}
+
+    assert client.post('/api/ai/transcribe/').json() == {'detail': 'audio_required'}
+    settings.AI_FEATURES_ENABLED = False
+    assert client.get('/api/ai/advice/').json() == {'detail': 'ai_disabled'}
+
+
+@pytest.mark.django_db
+def test_ai_views_require_a_token():
+    r = APIClient().get('/api/ai/advice/')
+    assert r.status_code == 401
+    assert r['WWW-Authenticate'].startswith('Bearer')
+
+
+def test_client_is_shared_per_event_loop():
+    async def two():
+        return ai_client.get_client(), ai_client.get_client()
+
+    first, second = asyncio.run(two())
+    assert first is second
+    assert asyncio.run(two())[0] is not first
+
+
+def test_session_closes_its_client_outside_asgi(monkeypatch):
+    monkeypatch.setattr(ai_client, '_shared', False)
+
+    async def call():
+        async with ai_client.session() as client:
+            pass
+        return client
+
+    assert asyncio.run(call()).is_closed
+
+    monkeypatch.setattr(ai_client, '_shared', True)
+
+    async def shared():
+        async with ai_client.session() as a:
+            pass
+        async with ai_client.session() as b:
+            pass
+        return a, b
+
+    a, b = asyncio.run(shared())
+    assert a is b and not a.is_closed
@@ -27,3 +27,129 @@ def test_bank_providers_and_connections(monkeypatch):
     rlist = client.get('/api/bank/connections')
     assert rlist.status_code == 200
     assert 'connections' in rlist.json()
+
+
+@pytest.mark.django_db
+def test_sync_now_enqueues_a_job_once(monkeypatch):
+    from transaction.views import bank
+
+    User = get_user_model()
+    User.objects.create_user(username='t3', password='p3', email='t3@example.com')
+    client = APIClient()
+    resp = client.post('/api/token/', {'username': 't3', 'password': 'p3'}, format='json')
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['access']}")
+
+    class FakeConn:
+        id = 'c1'
+        user_id = None
+        status = 'connected'
+
+    class FakeQS:
+        def __init__(self, found):
+            self.found = found
+
+        def first(self):
+            return FakeConn() if self.found else None
+
+    class FakeBankConnection:
+        @staticmethod
+        def objects(id=None, user_id=None):
+            return FakeQS(id == 'c1')
+
+    queued = {}
+
+    def fake_enqueue(conn):
+        created = conn.id not in queued
+        queued.setdefault(conn.id, {'_id': 'job1', 'status': 'queued'})
+        return queued[conn.id], created
+
+    monkeypatch.setattr(bank, 'BankConnection', FakeBankConnection)
+    monkeypatch.setattr(bank.BankSyncJobService, 'enqueue', staticmethod(fake_enqueue))
+
+    first = client.post('/api/bank/connections/c1/sync')
+    assert first.status_code == 202
+    assert first.json() == {'started': True, 'jobId': 'job1', 'status': 'queued'}
+    again = client.post('/api/bank/connections/c1/sync')
+    assert again.status_code == 200 and again.json()['jobId'] == 'job1'
+    assert client.post('/api/bank/connections/nope/sync').status_code == 404
+
+    monkeypatch.setattr(bank.BankSyncJobService, 'get', staticmethod(lambda uid, jid: None))
+    r = client.get('/api/bank/sync-jobs/job1')
+    assert r.status_code == 404 and r.json() == {'detail': 'not_found'}
+
+
+def test_webhook_verifies_signature_and_buffers(settings, monkeypatch):
+    from core.renderers import dumps
+    from transaction import webhooks
+
+    settings.BANK_WEBHOOK_SECRETS = {'monobank': 's3cret'}
+    queue = webhooks.LocalQueue()
+    queue.shared = True  # stands in for the Redis queue
+    monkeypatch.setattr(webhooks, '_queues', {webhooks.QUEUE_KEY: queue})
+    client = APIClient()
+    body = dumps({'events': [{'connectionId': 'c1', 'id': f'm{i}'} for i in range(3)]})
+
+    def post(provider, payload, signature):
+        return client.post(
+            f'/api/bank/webhooks/{provider}', payload,
+            content_type='application/json', HTTP_X_SIGNATURE=signature,
+        )
+
+    assert post('monobank', body, 'bad').status_code == 401
+    assert post('mockbank', body, webhooks.sign('s3cret', body)).status_code == 404
+    empty = dumps({'events': []})
+    assert post('monobank', empty, webhooks.sign('s3cret', empty)).status_code == 400
+    assert len(queue) == 0
+
+    r = post('monobank', body, webhooks.sign('s3cret', body))
+    assert r.status_code == 202 and r.json() == {'accepted': 3}
+    [batch] = webhooks.claim_batches(10, 'w1')
+    assert batch['provider'] == 'monobank' and len(batch['events']) == 3
+
+
+@pytest.mark.django_db
+def test_schedule_rejects_out_of_range_intervals():
+    User = get_user_model()
+    User.objects.create_user(username='t4', password='p4', email='t4@example.com')
+    client = APIClient()
+    resp = client.post('/api/token/', {'username': 't4', 'password': 'p4'}, format='json')
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['access']}")
+
+    for bad in (-3, 0, 169, 'often'):
+        r = client.post(
+            '/api/bank/schedule', {'enabled': True, 'intervalHours': bad}, format='json'
+        )
+        assert r.status_code == 400
+
+
+def test_webhook_is_applied_inline_without_a_shared_queue(settings, monkeypatch):
+    from core.renderers import dumps
+    from transaction import webhooks
+    from transaction.views import bank
+
+    settings.BANK_WEBHOOK_SECRETS = {'monobank': 's3cret'}
+    queue = webhooks.LocalQueue()
+    monkeypatch.setattr(webhooks, '_queues', {webhooks.QUEUE_KEY: queue})
+    ingested = []
+    monkeypatch.setattr(
+        bank.BankWebhookService, 'ingest', staticmethod(lambda batches: ingested.extend(batches))
+    )
+    body = dumps({'events': [{'connectionId': 'c1', 'id': 'm1'}]})
+
+    r = APIClient().post(
+        '/api/bank/webhooks/monobank', body, content_type='application/json',
+        HTTP_X_SIGNATURE=webhooks.sign('s3cret', body),
+    )
+    assert r.status_code == 200 and r.json() == {'accepted': 1}
+    assert [b['provider'] for b in ingested] == ['monobank']
+    assert len(queue) == 0
+
+    def down(batches):
+        raise RuntimeError('mongo down')
+
+    monkeypatch.setattr(bank.BankWebhookService, 'ingest', staticmethod(down))
+    r = APIClient().post(
+        '/api/bank/webhooks/monobank', body, content_type='application/json',
+        HTTP_X_SIGNATURE=webhooks.sign('s3cret', body),
+    )
+    assert r.status_code == 503
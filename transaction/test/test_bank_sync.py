@@ -0,0 +1,331 @@
+from datetime import datetime, timedelta
+import io
+import threading
+import time
+
+from django.core.management import call_command
+
+from transaction import services
+from transaction.models import Transaction
+from transaction.providers import MockBankProvider
+from transaction.services import (
+    BankSyncJobService, BankSyncService, BankWebhookService, GoalService, RollupService,
+    TransactionService,
+)
+
+
+def test_next_run_is_jittered_within_bounds():
+    now = datetime(2025, 1, 1)
+    runs = {BankSyncService.next_run_at(2, now) for _ in range(50)}
+    assert len(runs) > 1
+    assert all(
+        now + timedelta(hours=2) <= r <= now + timedelta(hours=2, minutes=12) for r in runs
+    )
+
+
+def test_next_run_clamps_bad_intervals():
+    now = datetime(2025, 1, 1)
+    assert BankSyncService.next_run_at(-5, now) >= now + timedelta(hours=1)
+    assert BankSyncService.next_run_at(10_000, now) <= now + timedelta(hours=168 * 1.1)
+
+
+def test_worker_drains_due_schedules_with_bounded_concurrency(monkeypatch):
+    due = [
+        {'_id': i, 'user_id': i, 'next_run_at': datetime.utcnow() - timedelta(seconds=30)}
+        for i in range(10)
+    ]
+    claims, completed = [], []
+    running = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def fake_claim(worker_id, limit, now=None):
+        claims.append(limit)
+        batch, due[:] = due[:limit], due[limit:]
+        return batch
+
+    def fake_sync(user_id):
+        with lock:
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+        time.sleep(0.01)
+        with lock:
+            running['now'] -= 1
+        if user_id == 3:
+            raise RuntimeError('provider down')
+
+    def fake_complete(schedule, worker_id, error=None, now=None):
+        completed.append((schedule['user_id'], error))
+        return True
+
+    monkeypatch.setattr(BankSyncJobService, 'claim', staticmethod(lambda *a, **kw: []))
+    monkeypatch.setattr(BankSyncService, 'claim_due', staticmethod(fake_claim))
+    monkeypatch.setattr(BankSyncService, 'sync_user', staticmethod(fake_sync))
+    monkeypatch.setattr(BankSyncService, 'complete', staticmethod(fake_complete))
+
+    out = io.StringIO()
+    call_command('bank_sync_worker', '--once', '--concurrency', '3', '--poll', '0', stdout=out)
+
+    assert sorted(u for u, _ in completed) == list(range(10))
+    assert dict(completed)[3].startswith('RuntimeError')
+    assert max(claims) <= 3 and running['max'] <= 3
+    assert 'synced=9 failed=1' in out.getvalue()
+    assert 'lag_max_s=3' in out.getvalue()
+
+
+def test_worker_survives_failing_lease_updates(monkeypatch):
+    due = [
+        {'_id': i, 'user_id': i, 'next_run_at': datetime.utcnow()} for i in range(4)
+    ]
+    synced, calls = [], {'claims': 0}
+
+    def fake_claim(worker_id, limit, now=None):
+        calls['claims'] += 1
+        if calls['claims'] == 1:
+            raise ConnectionError('mongo blip')
+        batch, due[:] = due[:limit], due[limit:]
+        return batch
+
+    def fake_complete(schedule, worker_id, error=None, now=None):
+        raise ConnectionError('mongo blip')
+
+    monkeypatch.setattr(BankSyncJobService, 'claim', staticmethod(lambda *a, **kw: []))
+    monkeypatch.setattr(BankSyncService, 'claim_due', staticmethod(fake_claim))
+    monkeypatch.setattr(BankSyncService, 'sync_user', staticmethod(synced.append))
+    monkeypatch.setattr(BankSyncService, 'complete', staticmethod(fake_complete))
+
+    out = io.StringIO()
+    # A failed claim is retried after the poll, even with --once
+    call_command('bank_sync_worker', '--once', '--concurrency', '2', '--poll', '0', stdout=out)
+
+    assert sorted(synced) == [0, 1, 2, 3]
+    assert 'synced=4 failed=0' in out.getvalue()
+
+
+def test_worker_runs_queued_jobs_before_schedules(monkeypatch):
+    created = datetime.utcnow() - timedelta(seconds=5)
+    jobs = [{'_id': f'j{i}', 'connection_id': f'c{i}', 'user_id': 1, 'created_at': created}
+            for i in range(2)]
+    finished, schedule_limits = [], []
+
+    def fake_claim_jobs(worker_id, limit, now=None):
+        batch, jobs[:] = jobs[:limit], jobs[limit:]
+        return batch
+
+    def fake_run(job):
+        if job['connection_id'] == 'c1':
+            raise LookupError('gone')
+        return {'fetched': 3, 'created': 1}
+
+    def fake_claim_due(worker_id, limit, now=None):
+        schedule_limits.append(limit)
+        return []
+
+    monkeypatch.setattr(BankSyncJobService, 'claim', staticmethod(fake_claim_jobs))
+    monkeypatch.setattr(BankSyncJobService, 'run', staticmethod(fake_run))
+    monkeypatch.setattr(
+        BankSyncJobService, 'finish',
+        staticmethod(lambda job, w, result=None, error=None: finished.append(
+            (job['_id'], result, error)
+        )),
+    )
+    monkeypatch.setattr(BankSyncService, 'claim_due', staticmethod(fake_claim_due))
+
+    out = io.StringIO()
+    call_command('bank_sync_worker', '--once', '--concurrency', '4', '--poll', '0', stdout=out)
+
+    assert sorted(finished, key=lambda f: f[0]) == [
+        ('j0', {'fetched': 3, 'created': 1}, None),
+        ('j1', None, 'LookupError: gone'),
+    ]
+    assert schedule_limits[0] == 2  # jobs took the first two slots
+    assert 'synced=1 failed=1' in out.getvalue()
+
+
+class _Conn:
+    id = 'c1'
+    user_id = 7
+
+
+def test_mock_provider_feed_is_deterministic_and_incremental():
+    now = datetime(2025, 3, 10, 12, 0)
+    provider = MockBankProvider(clock=lambda: now)
+    first = provider.fetch(_Conn(), None)
+    assert first.rows == MockBankProvider(clock=lambda: now).fetch(_Conn(), None).rows
+    assert first.watermark == '2025-03-10'
+    assert all(r['created_at'] <= now for r in first.rows)
+    assert any(r['category'] == 'salary' for r in first.rows)
+    ids = [r['provider_tx_id'] for r in first.rows]
+    assert len(ids) == len(set(ids))
+
+    later = MockBankProvider(clock=lambda: now + timedelta(days=1))
+    again = later.fetch(_Conn(), first.watermark)
+    # Resumes at the watermark day, so it overlaps the previous fetch
+    assert {r['provider_tx_id'] for r in again.rows} >= {
+        i for i in ids if i.startswith('2025-03-10')
+    }
+    assert min(r['created_at'] for r in again.rows) >= datetime(2025, 3, 10)
+
+
+def test_provider_upsert_is_one_bulk_write_and_skips_stored(monkeypatch):
+    class FakeCollection:
+        def __init__(self):
+            self.stored, self.calls = {}, []
+
+        def bulk_write(self, ops, ordered=True):
+            self.calls.append(len(ops))
+            upserted = {}
+            for i, op in enumerate(ops):
+                key = tuple(sorted(op._filter.items()))
+                if key not in self.stored:
+                    self.stored[key] = op._doc['$setOnInsert']
+                    upserted[i] = self.stored[key]['_id']
+            return type('Result', (), {'upserted_ids': upserted})
+
+    coll = FakeCollection()
+    applied = []
+    monkeypatch.setattr(Transaction, '_get_collection', classmethod(lambda cls: coll))
+    monkeypatch.setattr(RollupService, 'apply', staticmethod(applied.extend))
+    monkeypatch.setattr(GoalService, 'apply_transactions', staticmethod(lambda docs: None))
+    monkeypatch.setattr(services.suggestions, 'record', lambda docs: None)
+
+    rows = [
+        {'type': 'expense', 'amount': '1.50', 'category': 'cafe',
+         'bank_connection_id': 'c1', 'provider_tx_id': f't{i}'}
+        for i in range(10000)
+    ]
+    now = datetime(2025, 1, 1)
+
+    def docs():
+        return [TransactionService.build_document(7, r, created_at=now) for r in rows]
+
+    assert len(TransactionService.upsert_provider_documents(docs())) == 10000
+    rows.append({**rows[0], 'provider_tx_id': 'new'})
+    inserted = TransactionService.upsert_provider_documents(docs())
+    assert [d['provider_tx_id'] for d in inserted] == ['new']
+    assert coll.calls == [10000, 10001]
+    assert len(coll.stored) == 10001 and len(applied) == 10001
+
+
+def test_webhook_ingest_groups_by_connection_in_one_write(monkeypatch):
+    mono, priv = '64b000000000000000000001', '64b000000000000000000002'
+    conns = {
+        mono: type('Conn', (), {'id': mono, 'user_id': 1, 'provider_id': 'monobank'}),
+        priv: type('Conn', (), {'id': priv, 'user_id': 2, 'provider_id': 'privatbank'}),
+    }
+    updates, upserts, invalidated = [], [], []
+
+    class FakeQS(list):
+        def only(self, *fields):
+            return self
+
+        def update(self, **kw):
+            updates.append(kw)
+
+    class FakeBankConnection:
+        @staticmethod
+        def objects(id__in=None, **kw):
+            return FakeQS(conns[str(i)] for i in id__in if str(i) in conns)
+
+    monkeypatch.setattr(services, 'BankConnection', FakeBankConnection)
+    monkeypatch.setattr(services, 'invalidate_user', invalidated.append)
+    monkeypatch.setattr(
+        TransactionService, 'upsert_provider_documents',
+        staticmethod(lambda docs: upserts.append(docs) or docs[:-1]),
+    )
+
+    def event(cid, i, **kw):
+        return {'connectionId': cid, 'id': f't{i}', 'type': 'expense', 'amount': '9.99',
+                'category': 'cafe', 'time': '2025-01-01T12:00:00+02:00', **kw}
+
+    stats = BankWebhookService.ingest([
+        {'provider': 'monobank', 'events': [event(mono, i) for i in range(3)] + [
+            event(mono, 9, amount='-1'), event(priv, 1), event('nope', 1),
+        ]},
+        {'provider': 'privatbank', 'events': [event(priv, 2)]},
+    ])
+
+    assert stats == {'events': 7, 'created': 3, 'skipped': 3}
+    [docs] = upserts
+    assert [(d['bank_connection_id'], d['provider_tx_id']) for d in docs] == [
+        (mono, 't0'), (mono, 't1'), (mono, 't2'), (priv, 't2'),
+    ]
+    assert docs[0]['created_at'] == datetime(2025, 1, 1, 10, 0)
+    assert len(updates) == 1 and sorted(invalidated) == [1, 2]
+
+
+def test_webhook_worker_isolates_and_dead_letters_failing_deliveries(monkeypatch, settings):
+    from transaction import webhooks
+
+    settings.BANK_WEBHOOK_MAX_ATTEMPTS = 3
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    monkeypatch.setattr(webhooks, '_queues', {})
+    ingested = []
+
+    def fake_ingest(batches):
+        if any(b['events'] == ['poison'] for b in batches):
+            raise OverflowError('MongoDB can only handle up to 8-byte ints')
+        ingested.extend(batches)
+        return {'events': len(batches), 'created': len(batches), 'skipped': 0}
+
+    monkeypatch.setattr(BankWebhookService, 'ingest', staticmethod(fake_ingest))
+    webhooks.enqueue('monobank', ['poison'])
+    webhooks.enqueue('monobank', ['good'])
+
+    out = io.StringIO()
+    call_command('bank_webhook_worker', '--once', '--poll', '0', stdout=out)
+
+    assert [b['events'] for b in ingested] == [['good']]
+    assert len(webhooks.get_queue()) == 0
+    assert len(webhooks.get_queue(webhooks.DEAD_LETTER_KEY)) == 1
+    assert 'dead_lettered=1' in out.getvalue()
+
+    call_command('bank_webhook_worker', '--requeue-dead', stdout=out)
+    assert webhooks.claim_batches(10, 'w1')[0]['events'] == ['poison']
+
+
+def test_webhook_deliveries_survive_a_worker_crash(monkeypatch):
+    from transaction import webhooks
+
+    monkeypatch.setattr(webhooks, '_queues', {webhooks.QUEUE_KEY: webhooks.LocalQueue()})
+    webhooks.enqueue('monobank', ['a'])
+    webhooks.enqueue('monobank', ['b'])
+    webhooks.enqueue('monobank', ['c'])
+
+    # Claimed but never acknowledged: the worker died mid-batch
+    assert len(webhooks.claim_batches(2, 'w1')) == 2
+    assert len(webhooks.get_queue()) == 1
+
+    assert webhooks.recover('w1') == 2
+    assert [b['events'] for b in webhooks.claim_batches(10, 'w1')] == [['a'], ['b'], ['c']]
+    webhooks.ack('w1')
+    assert webhooks.recover('w1') == 0
+
+
+def test_sync_does_not_reconnect_a_connection_disconnected_meanwhile(monkeypatch):
+    from types import SimpleNamespace
+
+    from transaction.providers import FetchResult
+
+    conn = SimpleNamespace(
+        id='c1', user_id=1, provider_id='mockbank', sync_watermark=None, status='connected'
+    )
+    filters = []
+
+    class FakeConnections:
+        @staticmethod
+        def objects(**kw):
+            filters.append(kw)
+            return SimpleNamespace(update_one=lambda **update: 0)
+
+    monkeypatch.setattr(services, 'BankConnection', FakeConnections)
+    monkeypatch.setattr(
+        MockBankProvider, 'fetch', lambda self, c, w: FetchResult([], '2025-01-01')
+    )
+    monkeypatch.setattr(
+        TransactionService, 'upsert_provider_documents', staticmethod(lambda docs: [])
+    )
+    monkeypatch.setattr(services, 'invalidate_user', lambda user_id: None)
+
+    assert BankSyncService.sync_connection(conn) == {'fetched': 0, 'created': 0}
+    # The status is only set where the user has not disconnected meanwhile
+    assert filters == [{'id': 'c1', 'status__ne': 'disconnected'}]
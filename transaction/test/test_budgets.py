@@ -0,0 +1,50 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from transaction.services import BudgetService
+
+
+def test_budget_status_from_counter():
+    budget = {'category': 'food', 'limit_cents': 5000}
+    assert BudgetService.status(budget, 5510, '2025-03') == {
+        'category': 'food',
+        'month': '2025-03',
+        'limit': 50.0,
+        'spent': 55.1,
+        'remaining': -5.1,
+        'over_budget': True,
+    }
+    assert BudgetService.status(budget, 5000, '2025-03')['over_budget'] is False
+
+
+@pytest.mark.django_db
+def test_budgets_endpoint(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='b1', password='p1', email='b1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'b1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    seen = {}
+
+    def fake_user_budgets(user_id, month):
+        seen['month'] = month
+        return [BudgetService.status({'category': 'food', 'limit_cents': 100}, 0, month)]
+
+    monkeypatch.setattr(BudgetService, 'user_budgets', staticmethod(fake_user_budgets))
+
+    r = client.get('/api/budgets?month=2025-03')
+    assert r.status_code == 200
+    assert seen['month'] == '2025-03'
+    assert r.json()['items'][0]['remaining'] == 1.0
+    assert client.get('/api/budgets?month=2025-13').status_code == 400
+    r = client.post('/api/budgets', {'category': 'food', 'limit': '-1'}, format='json')
+    assert r.status_code == 400
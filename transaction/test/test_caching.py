@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from transaction.caching import (
+    bump_data_version, data_version, get_or_compute, hit_stats, reset_hit_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _locmem_cache(settings):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-caching',
+        }
+    }
+
+
+def test_empty_results_are_cached():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {}
+
+    assert get_or_compute('empty', compute, timeout=60) == {}
+    assert get_or_compute('empty', compute, timeout=60) == {}
+    assert len(calls) == 1
+
+
+def test_waiters_take_over_when_the_lock_holder_fails():
+    attempts = []
+
+    def compute():
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.2)
+            raise RuntimeError('mongo down')
+        return 'ok'
+
+    results, elapsed = [], []
+
+    def call():
+        started = time.monotonic()
+        try:
+            results.append(get_or_compute('failing', compute, timeout=60))
+        except RuntimeError:
+            results.append('error')
+        elapsed.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for t in threads:
+        t.start()
+        time.sleep(0.02)
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == ['error', 'ok', 'ok']
+    assert len(attempts) == 2  # one waiter recomputed, the other got its value
+    assert max(elapsed) < 1
+
+
+def test_summary_follows_data_version(monkeypatch):
+    from transaction.services import TransactionService
+
+    totals = {'value': 1.0}
+    monkeypatch.setattr(
+        TransactionService, '_compute_summary',
+        staticmethod(lambda user_id: {'net': totals['value']}),
+    )
+    before = data_version(42)
+    assert TransactionService.user_summary(42) == {'net': 1.0}
+    totals['value'] = 2.0
+    # Still served from cache until a write bumps the version
+    assert TransactionService.user_summary(42) == {'net': 1.0}
+    assert bump_data_version(42) == before + 1
+    assert TransactionService.user_summary(42) == {'net': 2.0}
+
+
+@pytest.mark.django_db
+def test_transaction_pages_are_cached_per_version(monkeypatch):
+    User = get_user_model()
+    user = User.objects.create_user(
+        username='c1', password='p1', email='c1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'c1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from transaction.views.transactions import TransactionViewSet
+    rows = [{'id': '1', 'type': 'expense', 'amount': '5.00', 'category': 'food'}]
+    calls = []
+
+    class FakeQS(list):
+        def count(self_inner):  # noqa: N802
+            return len(self_inner)
+
+    def fake_get_queryset(self):
+        calls.append(1)
+        return FakeQS(rows)
+
+    monkeypatch.setattr(TransactionViewSet, 'get_queryset', fake_get_queryset)
+    monkeypatch.setattr(
+        TransactionViewSet, '_rows', lambda self, qs, start, stop: list(qs[start:stop])
+    )
+    reset_hit_stats('tx_page')
+
+    first = client.get('/api/transactions/?category=food&page_size=5')
+    # Same normalized filter, different spelling: served from the cache
+    second = client.get('/api/transactions/?page_size=5&category=food,')
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert len(calls) == 1
+    assert client.get('/api/transactions/?category=food&page_size=6').status_code == 200
+    assert len(calls) == 2
+
+    rows.append({'id': '2', 'type': 'income', 'amount': '9.00', 'category': 'food'})
+    bump_data_version(user.id)
+    third = client.get('/api/transactions/?category=food&page_size=5')
+    assert len(third.json()['items']) == 2
+    assert hit_stats('tx_page') == {'hits': 1, 'misses': 3, 'hit_rate': 0.25}
+
+    # Other negotiated formats bypass the JSON page cache both ways
+    for _ in range(2):
+        html = client.get('/api/transactions/?category=food&page_size=5&format=api')
+        assert html['Content-Type'].startswith('text/html')
+    browsable = client.get(
+        '/api/transactions/?category=food&page_size=5', HTTP_ACCEPT='text/html'
+    )
+    assert browsable['Content-Type'].startswith('text/html')
+    assert hit_stats('tx_page') == {'hits': 1, 'misses': 3, 'hit_rate': 0.25}
+
+    # Validation errors are answered before the cache is consulted
+    assert client.get('/api/transactions/?page=0').status_code == 400
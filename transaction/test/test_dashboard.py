@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def _locmem_cache(settings):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-dashboard',
+        }
+    }
+
+
+@pytest.mark.django_db
+def test_dashboard_fetches_sections_concurrently(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='d1', password='p1', email='d1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'd1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from transaction.views import dashboard
+
+    def slow(value):
+        def fetch(user_id):
+            time.sleep(0.2)
+            return value
+        return fetch
+
+    monkeypatch.setattr(dashboard, 'SECTIONS', {
+        'summary': slow({'net': 1.0}),
+        'transactions': slow({'items': [], 'total': 0}),
+        'goals': slow([]),
+        'connections': slow([]),
+    })
+
+    t0 = time.perf_counter()
+    r = client.get('/api/dashboard')
+    elapsed = time.perf_counter() - t0
+    assert r.status_code == 200
+    assert elapsed < 0.6  # ~one read, not the sum of four
+    data = r.json()
+    assert data['user']['username'] == 'd1'
+    assert data['summary'] == {'net': 1.0}
+    assert 'errors' not in data
+
+    r = client.get('/api/dashboard', HTTP_IF_NONE_MATCH=r['ETag'])
+    assert r.status_code == 304
+
+    def broken(user_id):
+        raise RuntimeError('db down')
+
+    monkeypatch.setitem(dashboard.SECTIONS, 'goals', broken)
+    from transaction.caching import bump_data_version
+    bump_data_version(data['user']['id'])
+    r = client.get('/api/dashboard')
+    assert r.status_code == 200
+    assert r.json()['goals'] is None
+    assert r.json()['errors'] == ['goals']
+    assert 'ETag' not in r
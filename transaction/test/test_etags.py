@@ -0,0 +1,110 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from transaction.caching import bump_data_version
+
+
+@pytest.fixture(autouse=True)
+def _locmem_cache(settings):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-etags',
+        }
+    }
+    settings.TRANSACTIONS_PAGE_CACHE_TTL = 0
+
+
+@pytest.mark.django_db
+def test_transactions_list_not_modified(monkeypatch):
+    User = get_user_model()
+    user = User.objects.create_user(
+        username='e1', password='p1', email='e1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'e1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from transaction.views.transactions import TransactionViewSet
+    calls = []
+
+    class FakeQS(list):
+        def count(self_inner):  # noqa: N802
+            return len(self_inner)
+
+    def fake_get_queryset(self):
+        calls.append(1)
+        return FakeQS()
+
+    monkeypatch.setattr(TransactionViewSet, 'get_queryset', fake_get_queryset)
+
+    r = client.get('/api/transactions/?page_size=5')
+    assert r.status_code == 200
+    etag = r['ETag']
+    assert r['Cache-Control'] == 'private, no-cache'
+
+    r = client.get('/api/transactions/?page_size=5', HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304
+    assert r['ETag'] == etag
+    assert len(calls) == 1  # answered before any query
+
+    # Weak form matches too; other parameters get another tag
+    r = client.get('/api/transactions/?page_size=5', HTTP_IF_NONE_MATCH=f'W/{etag}')
+    assert r.status_code == 304
+    r = client.get('/api/transactions/?page_size=6', HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200 and r['ETag'] != etag
+
+    bump_data_version(user.id)
+    r = client.get('/api/transactions/?page_size=5', HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert r['ETag'] != etag
+
+    # Degraded responses (database down) are never tagged
+    def broken(self):
+        raise RuntimeError('db down')
+
+    monkeypatch.setattr(TransactionViewSet, 'get_queryset', broken)
+    r = client.get('/api/transactions/?page_size=5')
+    assert r.status_code == 200
+    assert 'ETag' not in r
+    assert r['Cache-Control'] == 'no-store'
+
+
+@pytest.mark.django_db
+def test_budgets_etag_rolls_over_with_the_month(monkeypatch):
+    from datetime import datetime
+
+    from transaction.services import BudgetService
+    from transaction.views import budget
+
+    get_user_model().objects.create_user(username='e2', password='p2', email='e2@example.com')
+    client = APIClient()
+    token = client.post('/api/token/', {'username': 'e2', 'password': 'p2'}, format='json')
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.data['access']}")
+
+    months = []
+    monkeypatch.setattr(BudgetService, 'user_budgets', staticmethod(
+        lambda user_id, month: months.append(month) or []
+    ))
+    now = {'value': datetime(2025, 1, 31, 23, 59)}
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now['value']
+
+    monkeypatch.setattr(budget, 'datetime', Clock)
+
+    etag = client.get('/api/budgets')['ETag']
+    assert client.get('/api/budgets', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    now['value'] = datetime(2025, 2, 1, 0, 1)
+    r = client.get('/api/budgets', HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200 and r['ETag'] != etag
+    assert months == ['2025-01', '2025-02']
@@ -1,2 +1,155 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+
 def test_placeholder_goals():
     assert True
+
+
+def test_linked_goal_progress_is_incremented(monkeypatch):
+    from transaction.models import Goal
+    from transaction.services import GoalService
+
+    captured = []
+
+    class FakeColl:
+        def bulk_write(self, ops, ordered=True):
+            captured.extend(ops)
+
+    monkeypatch.setattr(Goal, '_get_collection', classmethod(lambda cls: FakeColl()))
+
+    GoalService.apply_transactions([
+        {'user_id': 1, 'type': 'expense', 'category': 'savings', 'amount_cents': 1234},
+        # not yet migrated
+        {'user_id': 1, 'type': 'expense', 'category': 'savings', 'amount': 1.1},
+        {'user_id': 1, 'type': 'expense', 'category': 'food', 'amount_cents': 500},
+        {'user_id': 2, 'type': 'expense', 'category': 'savings', 'amount_cents': 100},
+    ])
+
+    def added(op):
+        return op._doc[0]['$set']['current_cents']['$add'][1]
+
+    ops = {(op._filter['user_id'], op._filter['category']): added(op) for op in captured}
+    assert ops == {(1, 'savings'): 1344, (1, 'food'): 500, (2, 'savings'): 100}
+
+
+def test_income_in_the_linked_category_lowers_progress(monkeypatch):
+    from transaction.models import Goal
+    from transaction.services import GoalService
+
+    captured = []
+
+    class FakeColl:
+        def bulk_write(self, ops, ordered=True):
+            captured.extend(ops)
+
+    monkeypatch.setattr(Goal, '_get_collection', classmethod(lambda cls: FakeColl()))
+    GoalService.apply_transactions([
+        {'user_id': 1, 'type': 'expense', 'category': 'savings', 'amount_cents': 5000},
+        {'user_id': 1, 'type': 'income', 'category': 'savings', 'amount_cents': 1500},
+        # Balanced out: no update at all
+        {'user_id': 1, 'type': 'expense', 'category': 'trip', 'amount_cents': 700},
+        {'user_id': 1, 'type': 'income', 'category': 'trip', 'amount_cents': 700},
+    ])
+
+    [op] = captured
+    assert op._filter == {'user_id': 1, 'category': 'savings'}
+    assert op._doc[0]['$set']['current_cents']['$add'][1] == 3500
+
+
+def test_progress_update_seeds_cents_from_legacy_amount():
+    from transaction.services import GoalService
+
+    seed, set_cents = GoalService._progress_inc(1500)
+    current = seed['$set']['current_cents']['$add'][0]
+    # Missing current_cents falls back to the legacy current_amount in cents
+    assert current['$ifNull'][0]['$ifNull'][0] == '$current_cents'
+    assert '$current_amount' in str(current['$ifNull'][0]['$ifNull'][1])
+    assert set_cents == {'$set': {'current_amount': {'$divide': ['$current_cents', 100]}}}
+
+
+def test_goal_money_reads_cents_then_legacy_floats():
+    from transaction.forecast import _cents
+    from transaction.models import Goal
+    from transaction.serializers import GoalSerializer
+
+    migrated = Goal(title='a', target_cents=10000, target_amount=1.0, current_cents=2550)
+    legacy = Goal(title='b', target_amount=99.99, current_amount=0.1)
+    assert _cents(migrated, 'target_cents', 'target_amount') == 10000
+    assert _cents(legacy, 'target_cents', 'target_amount') == 9999
+    assert _cents(Goal(title='c'), 'current_cents', 'current_amount') == 0
+    data = GoalSerializer(legacy).data
+    assert (data['target_amount'], data['current_amount']) == (99.99, 0.1)
+    assert GoalSerializer(migrated).data['current_amount'] == 25.5
+
+
+@pytest.mark.django_db
+def test_goal_contribution_endpoint(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='g1', password='p1', email='g1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'g1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from decimal import Decimal
+    from transaction.models import Goal
+    from transaction.services import GoalService
+    seen = {}
+
+    def fake_contribute(user_id, goal_id, amount):
+        seen['args'] = (goal_id, amount)
+        if goal_id == 'missing':
+            return None
+        return Goal(title='Bike', current_cents=1500, target_cents=50000, category='savings')
+
+    monkeypatch.setattr(GoalService, 'contribute', staticmethod(fake_contribute))
+
+    r = client.post('/api/goals/abc/contribute/', {'amount': '15.00'}, format='json')
+    assert r.status_code == 200
+    assert seen['args'] == ('abc', Decimal('15.00'))
+    assert r.json()['current_amount'] == 15.0
+    assert r.json()['category'] == 'savings'
+    r = client.post('/api/goals/abc/contribute/', {'amount': '0'}, format='json')
+    assert r.status_code == 400
+    r = client.post('/api/goals/missing/contribute/', {'amount': '1'}, format='json')
+    assert r.status_code == 404
+
+
+def test_forecast_projects_goals_from_savings_rate():
+    from datetime import date, datetime
+
+    import numpy as np
+    from transaction import forecast
+    from transaction.models import Goal
+
+    # Older months weigh less: a recent drop pulls the rate down
+    series = np.array([100000.0] * 24 + [0.0] * 6)
+    rate = forecast.savings_rate(series)
+    assert 40000 < rate < 60000
+    assert forecast.savings_rate(np.zeros(0)) == 0.0
+
+    today = date(2026, 1, 1)
+    goals = [
+        Goal(title='bike', target_cents=300000, current_cents=100000,
+             due_date=datetime(2026, 7, 1)),
+        Goal(title='no target'),
+        Goal(title='done', target_cents=100, current_cents=100, due_date=datetime(2025, 1, 1)),
+    ]
+    bike, missing, done = forecast.forecast_goals(goals, 100000.0, today)
+    assert bike['monthly_savings'] == 1000.0
+    assert bike['projected_completion'] == '2026-03-03'  # 2 months of savings
+    assert bike['required_monthly'] == 336.33  # 2000.00 over 181 days
+    assert bike['on_track'] is True
+    assert missing is None
+    assert done['on_track'] is True and done['required_monthly'] == 0.0
+
+    stalled = forecast.forecast_goals(goals, -5000.0, today)[0]
+    assert stalled['projected_completion'] is None and stalled['on_track'] is False
@@ -0,0 +1,85 @@
+import io
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+
+from transaction.importers import parse_ofx, row_hash
+
+
+OFX = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>USD
+<BANKACCTFROM><BANKID>121000248<ACCTID>1111<ACCTTYPE>CHECKING</BANKACCTFROM><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250102120000[-5:EST]<TRNAMT>-12.50<FITID>A1<NAME>Coffee
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250103<TRNAMT>1000.00<FITID>A2<NAME>Salary</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def test_parse_ofx_sgml():
+    rows = [row for _, row in parse_ofx(io.BytesIO(OFX))]
+    account = '121000248/1111'
+    assert rows == [
+        {'date': '2025-01-02', 'amount': '-12.50', 'description': 'Coffee', 'fitid': 'A1',
+         'account': account},
+        {'date': '2025-01-03', 'amount': '1000.00', 'description': 'Salary', 'fitid': 'A2',
+         'account': account},
+    ]
+
+
+def test_same_fitid_in_two_accounts_is_not_a_duplicate():
+    other = OFX.replace(b'<ACCTID>1111', b'<ACCTID>2222')
+    [(_, a), _] = parse_ofx(io.BytesIO(OFX))
+    [(_, b), _] = parse_ofx(io.BytesIO(other))
+    assert a['fitid'] == b['fitid'] and a['account'] != b['account']
+    assert row_hash({}, a['fitid'], 1, a['account']) != row_hash({}, b['fitid'], 1, b['account'])
+    assert row_hash({}, a['fitid'], 1, a['account']) == row_hash({}, a['fitid'], 2, a['account'])
+
+
+@pytest.mark.django_db
+def test_import_csv_reports_duplicates_and_errors(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(username='i1', password='p1', email='i1@example.com')
+    client = APIClient()
+    token = client.post(
+        '/api/token/', {'username': 'i1', 'password': 'p1'}, format='json'
+    ).data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from transaction.services import TransactionService
+    stored = set()
+
+    def fake_insert(docs):
+        failed = {}
+        for i, doc in enumerate(docs):
+            if doc['import_hash'] in stored:
+                failed[i] = 11000
+            stored.add(doc['import_hash'])
+        return failed
+
+    monkeypatch.setattr(TransactionService, 'insert_documents', fake_insert)
+
+    body = (
+        b"Date,Amount,Description,Category\n"
+        b"2025-01-01,-5.00,Coffee,food\n"
+        b"2025-01-01,-5.00,Coffee,food\n"
+        b"02.01.2025,\"1,200.50\",Pay,\n"
+        b"not-a-date,x,y,z\n"
+    )
+
+    def upload():
+        return client.post(
+            '/api/transactions/import/',
+            {'file': SimpleUploadedFile('statement.csv', body, 'text/csv')},
+            format='multipart',
+        )
+
+    first = upload().json()
+    assert (first['processed'], first['created'], first['failed']) == (4, 3, 1)
+    assert first['errors'][0]['row'] == 5
+
+    again = upload().json()
+    assert (again['created'], again['duplicates']) == (0, 3)
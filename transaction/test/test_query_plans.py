@@ -0,0 +1,72 @@
+"""explain()-based guard for the filtered transaction list query shapes.
+
+Each supported filter combination must be answered from an index, with the
+list sort (created_at, _id desc) coming from the index as well. Needs a
+reachable MongoDB (CI runs one); skipped otherwise.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.conf import settings
+from pymongo import MongoClient
+
+from transaction.models import Transaction
+from transaction.services import TransactionService
+
+
+def _mongo_available() -> bool:
+    try:
+        client = MongoClient(settings.MONGO_URI, serverSelectionTimeoutMS=1000)
+        client.admin.command('ping')
+        return True
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _mongo_available(), reason='MongoDB not reachable')
+
+DATES = {'date_from': datetime(2025, 1, 1), 'date_to': datetime(2025, 3, 31, 23, 59, 59)}
+
+CASES = [
+    ('recent', {}),
+    ('date range', DATES),
+    ('category + dates', {'categories': ['food'], **DATES}),
+    ('categories + dates', {'categories': ['food', 'rent'], **DATES}),
+    ('type + dates', {'type_': 'expense', **DATES}),
+    ('amount range + dates', {
+        'min_amount': Decimal('10'), 'max_amount': Decimal('500'), **DATES,
+    }),
+    ('search + type', {'search': 'coffee', 'type_': 'expense'}),
+]
+
+
+def _stages(plan: dict):
+    """Yield every stage of a (possibly nested) winning plan."""
+    plan = plan.get('queryPlan', plan)
+    yield plan
+    children = list(plan.get('inputStages', []))
+    if 'inputStage' in plan:
+        children.append(plan['inputStage'])
+    for child in children:
+        yield from _stages(child)
+
+
+@pytest.mark.parametrize('fallback', [False, True])
+@pytest.mark.parametrize('name,filters', CASES, ids=[c[0] for c in CASES])
+def test_filtered_list_uses_index(settings, name, filters, fallback):
+    settings.AMOUNT_LEGACY_FALLBACK = fallback
+    Transaction.ensure_indexes()
+    qs = TransactionService.list_user_transactions_filtered(user_id=1, **filters)
+    plan = qs.limit(20).explain()['queryPlanner']['winningPlan']
+    stages = list(_stages(plan))
+    names = [s.get('stage') for s in stages]
+    assert 'COLLSCAN' not in names, (name, plan)
+    assert any(s.get('indexName') for s in stages), (name, plan)
+    if 'search' in filters:
+        # Relevance ordering always sorts; the text stage must still be used.
+        assert 'TEXT' in names or 'TEXT_MATCH' in names, (name, plan)
+    elif not (fallback and 'min_amount' in filters):
+        # The $or of the legacy amount fallback may need a merge sort;
+        # every other shape must take its order straight from the index.
+        assert 'SORT' not in names, (name, plan)
@@ -0,0 +1,46 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from bson import ObjectId
+from rest_framework.exceptions import ParseError
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+
+OID = ObjectId('65a1b2c3d4e5f60718293a4b')
+PAYLOAD = {
+    'id': OID,
+    'amount': Decimal('12.50'),
+    'created_at': datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    'naive': datetime(2025, 1, 2, 3, 4, 5),
+    'text': 'café\u2028',
+}
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_renderer_handles_mongo_and_money_types(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(renderers, 'orjson', None)
+    body = FastJSONRenderer().render(PAYLOAD)
+    assert b'\\u2028' in body
+    assert json.loads(body) == {
+        'id': str(OID),
+        'amount': 12.5,
+        'created_at': '2025-01-02T03:04:05Z',
+        'naive': '2025-01-02T03:04:05',
+        'text': 'café\u2028',
+    }
+    assert FastJSONRenderer().render(None) == b''
+
+
+def test_indent_and_parser():
+    pretty = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+    assert pretty == b'{\n  "a": 1\n}'
+
+    parser = FastJSONParser()
+    assert parser.parse(io.BytesIO(b'{"amount": "1.5"}')) == {'amount': '1.5'}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b'{"amount":'))
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+from transaction.models import MonthlyRollup
+from transaction.services import RollupService
+
+
+def test_rollup_apply_merges_deltas(monkeypatch):
+    captured = []
+
+    class FakeColl:
+        def bulk_write(self, ops, ordered=True):
+            captured.extend(ops)
+
+    monkeypatch.setattr(MonthlyRollup, '_get_collection', classmethod(lambda cls: FakeColl()))
+
+    def doc(amount, category, created_at, type_='expense'):
+        return {
+            'user_id': 7, 'type': type_, 'amount': amount,
+            'category': category, 'created_at': created_at,
+        }
+
+    RollupService.apply([
+        doc(2.5, 'food', datetime(2025, 1, 3)),
+        doc(1.5, 'food', datetime(2025, 1, 20)),
+        doc(9.0, 'food', datetime(2025, 2, 1)),
+        doc(100.0, 'pay', datetime(2025, 1, 5), 'income'),
+    ])
+
+    ops = {
+        (op._filter['month'], op._filter['category'], op._filter['type']): op._doc['$inc']
+        for op in captured
+    }
+    assert ops == {
+        ('2025-01', 'food', 'expense'): {'total_cents': 400, 'count': 2},
+        ('2025-02', 'food', 'expense'): {'total_cents': 900, 'count': 1},
+        ('2025-01', 'pay', 'income'): {'total_cents': 10000, 'count': 1},
+    }
+    assert all(op._upsert for op in captured)
+
+
+def test_rebuild_only_rewrites_drifted_keys(monkeypatch):
+    from transaction.models import Transaction
+
+    writes, deletes = [], []
+
+    class FakeRollups:
+        def find(self, query, projection):
+            return [
+                {'_id': 1, 'month': '2025-01', 'category': 'food', 'type': 'expense',
+                 'total_cents': 400, 'count': 2},
+                {'_id': 2, 'month': '2025-01', 'category': 'pay', 'type': 'income',
+                 'total_cents': 999, 'count': 1},
+                {'_id': 3, 'month': '2024-12', 'category': 'gone', 'type': 'expense',
+                 'total_cents': 50, 'count': 1},
+            ]
+
+        def bulk_write(self, ops, ordered=True):
+            writes.extend(ops)
+
+        def delete_many(self, query):
+            deletes.append(query)
+
+    class FakeTransactions:
+        def aggregate(self, pipeline, allowDiskUse=False):
+            return [
+                {'_id': {'month': '2025-01', 'category': 'food', 'type': 'expense'},
+                 'cents': 400, 'count': 2},
+                {'_id': {'month': '2025-01', 'category': 'pay', 'type': 'income'},
+                 'cents': 10000, 'count': 1},
+                {'_id': {'month': '2025-02', 'category': 'food', 'type': 'expense'},
+                 'cents': 900, 'count': 1},
+            ]
+
+    monkeypatch.setattr(MonthlyRollup, '_get_collection', classmethod(lambda cls: FakeRollups()))
+    monkeypatch.setattr(
+        Transaction, '_get_collection', classmethod(lambda cls: FakeTransactions())
+    )
+
+    assert RollupService.rebuild_user(7) == 3
+    # No delete-then-insert: drifted and new keys are $set upserts
+    assert {(op._filter['month'], op._filter['category']) for op in writes} == {
+        ('2025-01', 'pay'), ('2025-02', 'food'),
+    }
+    assert all(op._upsert and '$set' in op._doc for op in writes)
+    assert deletes == [{'_id': {'$in': [3]}}]
+
+
+def test_failed_derived_writes_do_not_fail_the_insert(monkeypatch):
+    from transaction.models import Transaction
+    from transaction import suggestions
+    from transaction.services import GoalService, TransactionService
+
+    class FakeTransactions:
+        def insert_many(self, docs, ordered=True):
+            pass
+
+    def broken(docs):
+        raise RuntimeError('rollups down')
+
+    applied = []
+    monkeypatch.setattr(
+        Transaction, '_get_collection', classmethod(lambda cls: FakeTransactions())
+    )
+    monkeypatch.setattr(RollupService, 'apply', staticmethod(broken))
+    monkeypatch.setattr(GoalService, 'apply_transactions', staticmethod(applied.append))
+    monkeypatch.setattr(suggestions, 'record', applied.append)
+
+    docs = [{'user_id': 7, 'type': 'expense', 'amount': 1.0, 'category': 'food'}]
+    # The documents are stored: the remaining steps still run and nothing raises
+    assert TransactionService.insert_documents(docs) == {}
+    assert applied == [docs, docs]
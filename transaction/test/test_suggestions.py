@@ -0,0 +1,75 @@
+from datetime import datetime
+import threading
+
+import pytest
+
+from transaction import suggestions
+from transaction.caching import bump_data_version
+
+
+@pytest.fixture(autouse=True)
+def _locmem_cache(settings, monkeypatch):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-suggestions',
+        }
+    }
+    suggestions._lru.clear()
+    monkeypatch.setattr(suggestions, '_store', None)
+
+
+def _doc(category, created_at, user_id=5):
+    return {'user_id': user_id, 'category': category, 'created_at': created_at}
+
+
+def test_rebuild_from_rollups_then_record(monkeypatch):
+    rollups = [
+        {'month': '2024-01', 'category': 'Food', 'count': 10},
+        {'month': '2025-06', 'category': 'Fuel', 'count': 3},
+        {'month': '2025-06', 'category': 'rent', 'count': 1},
+    ]
+
+    class FakeQS:
+        def only(self, *_fields):
+            return self
+
+        def as_pymongo(self):
+            return rollups
+
+    class FakeRollup:
+        @staticmethod
+        def objects(**_kw):
+            return FakeQS()
+
+    monkeypatch.setattr(suggestions, 'MonthlyRollup', FakeRollup)
+
+    # 10 uses 17 months ago weigh less than 3 recent ones
+    assert suggestions.suggest(5, 'f') == [
+        {'category': 'Fuel', 'count': 3},
+        {'category': 'Food', 'count': 10},
+    ]
+
+    rollups.clear()  # from here on the stored index must be used
+    suggestions.record([_doc('food court', datetime(2025, 7, 1))] * 2)
+    # Served from the in-process index until the data version moves
+    assert [i['category'] for i in suggestions.suggest(5, 'FO')] == ['Food']
+    bump_data_version(5)
+    assert [i['category'] for i in suggestions.suggest(5, 'FO')] == ['food court', 'Food']
+    assert suggestions.suggest(5, 'r') == [{'category': 'rent', 'count': 1}]
+    assert len(suggestions.suggest(5, '', limit=2)) == 2
+    assert suggestions.suggest(5, 'x') == []
+
+
+def test_concurrent_records_are_not_lost(monkeypatch):
+    monkeypatch.setattr(suggestions, '_rebuild', lambda user_id: {})
+    suggestions.get_store().replace(5, {})
+    docs = [_doc('food', datetime(2025, 7, 1))] * 50
+
+    threads = [threading.Thread(target=suggestions.record, args=(docs,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert suggestions.get_store().get(5)['food'][1] == 400
@@ -62,6 +62,7 @@ def test_transactions_filters_and_pagination(monkeypatch):
     body = r.json()
     assert 'items' in body and len(body['items']) == 5
     assert 'pagination' in body and body['pagination']['total'] == 30
+    assert body['pagination']['total_is_estimate'] is False
 
 
 @pytest.mark.django_db
@@ -92,3 +93,357 @@ def test_transactions_summary(monkeypatch):
     data = r.json()
     assert data['totalIncome'] == 120.5
     assert data['net'] == 100.0
+
+
+@pytest.mark.django_db
+def test_transactions_cursor_pagination(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='c1', password='p1', email='c1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'c1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    class DummyTx:
+        def __init__(self, _id, created_at):
+            self.id = _id
+            self.type = 'expense'
+            self.amount = 5
+            self.category = 'food'
+            self.description = ''
+            self.created_at = created_at
+
+    from bson import ObjectId
+    from datetime import datetime, timedelta
+    base = datetime(2025, 1, 31, 12, 0, 0)
+    fake = [DummyTx(ObjectId(), base - timedelta(days=i)) for i in range(8)]
+
+    class FakeQS(list):
+        def count(self_inner):  # noqa: N802
+            raise AssertionError('cursor mode must not count')
+
+        def filter(self_inner, **kw):
+            created_at = kw['__raw__']['$or'][0]['created_at']['$lt']
+            return FakeQS(t for t in self_inner if t.created_at < created_at)
+
+    from transaction.views.transactions import TransactionViewSet
+    monkeypatch.setattr(TransactionViewSet, 'get_queryset', lambda self: FakeQS(fake))
+
+    r = client.get('/api/transactions/?cursor=&page_size=5')
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body['items']) == 5
+    assert 'pagination' not in body
+    assert body['next_cursor']
+
+    r2 = client.get(f"/api/transactions/?cursor={body['next_cursor']}&page_size=5")
+    body2 = r2.json()
+    assert [i['id'] for i in body2['items']] == [str(t.id) for t in fake[5:]]
+    assert body2['next_cursor'] is None
+
+    bad = client.get('/api/transactions/?cursor=not-a-cursor')
+    assert bad.status_code == 400
+
+
+@pytest.mark.django_db
+def test_transactions_count_modes(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='n1', password='p1', email='n1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'n1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    class DummyTx:
+        def __init__(self, i):
+            self.id = str(i)
+            self.type = 'income'
+            self.amount = i
+            self.category = 'catA'
+            self.description = ''
+            self.created_at = None
+
+    class FakeQS(list):
+        def count(self_inner):  # noqa: N802
+            raise AssertionError('count=none must not count')
+
+    from transaction.views.transactions import TransactionViewSet
+    monkeypatch.setattr(
+        TransactionViewSet, 'get_queryset',
+        lambda self: FakeQS(DummyTx(i) for i in range(12)),
+    )
+
+    r = client.get('/api/transactions/?count=none&page=2&page_size=5')
+    assert r.status_code == 200
+    body = r.json()
+    assert [i['id'] for i in body['items']] == ['5', '6', '7', '8', '9']
+    assert body['pagination'] == {'page': 2, 'page_size': 5, 'has_next': True}
+
+    last = client.get('/api/transactions/?count=none&page=3&page_size=5').json()
+    assert len(last['items']) == 2
+    assert last['pagination']['has_next'] is False
+
+    bad = client.get('/api/transactions/?count=maybe')
+    assert bad.status_code == 400
+
+
+def test_raw_fast_path_matches_serializer():
+    from bson import ObjectId
+    from datetime import datetime
+    from decimal import Decimal
+    from transaction.models import Transaction
+    from transaction.serializers import TransactionSerializer
+    from transaction.services import TransactionService
+
+    tx = Transaction(
+        id=ObjectId(),
+        user_id=1,
+        type='expense',
+        amount=Decimal('12.34'),
+        category='food',
+        description='lunch',
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 678000),
+    )
+    raw = tx.to_mongo().to_dict()
+    assert TransactionService.to_api_dict(raw) == TransactionSerializer(tx).data
+
+
+@pytest.mark.django_db
+def test_transactions_bulk_create(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='b1', password='p1', email='b1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'b1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from bson import ObjectId
+    from transaction.services import TransactionService
+    written = []
+
+    def fake_bulk(user_id, rows):
+        written.append(rows)
+        return [ObjectId() for _ in rows]
+
+    monkeypatch.setattr(TransactionService, 'bulk_create_transactions', fake_bulk)
+
+    items = [
+        {'type': 'income', 'amount': '10.00', 'category': 'salary'},
+        {'type': 'bogus', 'amount': '1', 'category': 'x'},
+        {'type': 'expense', 'amount': '2.50', 'category': 'food'},
+    ]
+    r = client.post('/api/transactions/bulk/', items, format='json')
+    assert r.status_code == 207
+    body = r.json()
+    assert body['created'] == 2 and body['failed'] == 1
+    assert [x['status'] for x in body['results']] == ['created', 'error', 'created']
+    assert 'type' in body['results'][1]['errors']
+    assert len(written) == 1 and len(written[0]) == 2
+
+    empty = client.post('/api/transactions/bulk/', [], format='json')
+    assert empty.status_code == 400
+
+
+@pytest.mark.django_db
+def test_transactions_export_streams(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='e1', password='p1', email='e1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'e1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    rows = [
+        {
+            'id': str(i), 'type': 'expense', 'amount': 1.5 * i, 'category': 'food',
+            'description': 'a, "quoted"', 'created_at': '2025-01-02T03:04:05',
+            'date': '2025-01-02',
+        }
+        for i in range(1200)
+    ]
+    from transaction.services import TransactionService
+    from transaction.views.transactions import TransactionViewSet
+    monkeypatch.setattr(TransactionViewSet, 'get_queryset', lambda self: [])
+    monkeypatch.setattr(
+        TransactionService, 'iter_api_rows', lambda qs, batch_size=1000: iter(rows)
+    )
+
+    r = client.get('/api/transactions/export/?fmt=csv')
+    assert r.status_code == 200
+    assert r['Content-Type'].startswith('text/csv')
+    import csv
+    import io
+    parsed = list(csv.DictReader(io.StringIO(b''.join(r.streaming_content).decode())))
+    assert len(parsed) == 1200
+    assert parsed[1]['description'] == 'a, "quoted"'
+
+    import gzip
+    import json
+    rz = client.get('/api/transactions/export/?fmt=ndjson&gzip=1')
+    assert rz['Content-Type'] == 'application/gzip'
+    lines = gzip.decompress(b''.join(rz.streaming_content)).decode().splitlines()
+    assert len(lines) == 1200 and json.loads(lines[-1])['id'] == '1199'
+
+    assert client.get('/api/transactions/export/?fmt=xml').status_code == 400
+
+
+@pytest.mark.django_db
+def test_transactions_analytics(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='a1', password='p1', email='a1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'a1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from datetime import datetime
+    from transaction.services import AnalyticsService
+    seen = {}
+
+    def fake_rows(user_id, date_from, date_to):
+        seen['range'] = (date_from, date_to)
+        return [
+            ('2025-01', 'food', 'expense', 3000, 3),
+            ('2025-01', 'salary', 'income', 100000, 1),
+            ('2025-02', 'food', 'expense', 2000, 2),
+            ('2025-02', 'rent', 'expense', 50000, 1),
+        ]
+
+    monkeypatch.setattr(AnalyticsService, '_rows', staticmethod(fake_rows))
+    monkeypatch.setattr(
+        AnalyticsService, 'breakdown',
+        staticmethod(lambda user_id, **kw: AnalyticsService._compute(
+            user_id, kw['date_from'], kw['date_to'], kw['top'])),
+    )
+
+    r = client.get('/api/transactions/analytics/?date_from=2025-01-01&date_to=2025-02-28&top=1')
+    assert r.status_code == 200
+    data = r.json()
+    assert seen['range'] == (datetime(2025, 1, 1), datetime(2025, 2, 28, 23, 59, 59))
+    assert data['totals'] == {'income': 1000.0, 'expense': 550.0, 'net': 450.0}
+    assert [m['month'] for m in data['by_month']] == ['2025-01', '2025-02']
+    assert data['by_month'][1]['net'] == -520.0
+    assert data['top_categories'] == [{'category': 'rent', 'total': 500.0, 'count': 1}]
+    assert len(data['by_month_category']) == 4
+
+    assert AnalyticsService._month_aligned(*seen['range'])
+    assert not AnalyticsService._month_aligned(datetime(2025, 1, 2), None)
+    # A date_to inside the first day of a month is not a month boundary
+    assert not AnalyticsService._month_aligned(datetime(2024, 3, 1), datetime(2024, 3, 1, 10))
+    assert not AnalyticsService._month_aligned(datetime(2024, 3, 1), datetime(2024, 3, 1))
+    assert not AnalyticsService._month_aligned(
+        None, datetime(2024, 2, 29, 23, 59, 59, 500000)
+    )
+    assert client.get('/api/transactions/analytics/?top=0').status_code == 400
+
+
+@pytest.mark.django_db
+def test_transactions_search(monkeypatch):
+    User = get_user_model()
+    User.objects.create_user(
+        username='q1', password='p1', email='q1@example.com'
+    )
+    client = APIClient()
+    token_resp = client.post(
+        '/api/token/',
+        {'username': 'q1', 'password': 'p1'},
+        format='json',
+    )
+    token = token_resp.data['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    from transaction.services import TransactionService
+    seen = {}
+
+    def fake_filtered(**kwargs):
+        seen.update(kwargs)
+        return []
+
+    monkeypatch.setattr(
+        TransactionService, 'list_user_transactions_filtered', staticmethod(fake_filtered)
+    )
+
+    r = client.get('/api/transactions/?q=%20coffee%20&type=expense')
+    assert r.status_code == 200
+    assert seen['search'] == 'coffee'
+    assert seen['type_'] == 'expense'
+
+    client.get('/api/transactions/?q=')
+    assert seen['search'] is None
+
+    r = client.get('/api/transactions/?q=coffee&cursor=')
+    assert r.status_code == 400
+    assert r.json()['detail'] == 'cursor_unsupported_with_q'
+    assert client.get('/api/transactions/?q=' + 'x' * 101).status_code == 400
+
+
+def test_capped_total_skips_the_facet():
+    from transaction.services import TransactionService
+
+    class FakeQS:
+        limit_ = None
+
+        def aggregate(self, pipeline):
+            raise AssertionError('a capped count must not run the $facet')
+
+        def only(self, *_fields):
+            return self
+
+        def as_pymongo(self):
+            return [{'_id': i, 'type': 'expense', 'amount': 1.0, 'category': 'x',
+                     'description': '', 'created_at': None} for i in range(50)]
+
+        def limit(self, n):
+            self.limit_ = n
+            return self
+
+        def count(self, with_limit_and_skip=False):
+            assert with_limit_and_skip
+            return min(self.limit_, 50)
+
+    qs = FakeQS()
+    items, total = TransactionService.page_with_total(qs, start=10, limit=5, count_cap=20)
+    assert [i['id'] for i in items] == ['10', '11', '12', '13', '14']
+    assert total == 20
+
+
+def test_no_transaction_index_is_a_prefix_of_another():
+    from transaction.models import Transaction
+
+    keys = [
+        tuple(spec['fields']) for spec in Transaction._meta['index_specs']
+        if not spec.get('unique') and not spec.get('partialFilterExpression')
+    ]
+    for a in keys:
+        for b in keys:
+            assert a == b or b[:len(a)] != a, (a, b)
@@ -2,6 +2,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views.transactions import TransactionViewSet
 from .views.goal import GoalViewSet
+from .views.budget import BudgetDetailView, BudgetsView
+from .views.dashboard import DashboardView
 from .views.ai import AIAdviceView, AITranscribeView
 from .views.auth import RegisterView, MeView
 from .views.bank import (
@@ -10,7 +12,9 @@ from .views.bank import (
     BankStartConnectView,
     BankDisconnectView,
     BankSyncNowView,
+    BankSyncJobView,
     BankScheduleView,
+    BankWebhookView,
 )
 
 router = DefaultRouter()
@@ -27,6 +31,9 @@ urlpatterns = [
     # Allow GET for advice (frontend uses GET), route both GET and POST to same view
     path('ai/advice/', AIAdviceView.as_view(), name='ai-advice'),
     path('ai/transcribe/', AITranscribeView.as_view(), name='ai-transcribe'),
+    path('dashboard', DashboardView.as_view(), name='dashboard'),
+    path('budgets', BudgetsView.as_view(), name='budgets'),
+    path('budgets/<str:category>', BudgetDetailView.as_view(), name='budget-detail'),
     # Auth endpoints
     path('auth/register', RegisterView.as_view(), name='auth-register'),
     path('auth/me', MeView.as_view(), name='auth-me'),
@@ -44,6 +51,8 @@ urlpatterns = [
         BankSyncNowView.as_view(),
         name='bank-sync-now',
     ),
+    path('bank/sync-jobs/<str:job_id>', BankSyncJobView.as_view(), name='bank-sync-job'),
+    path('bank/webhooks/<str:provider_id>', BankWebhookView.as_view(), name='bank-webhook'),
     path('bank/schedule', BankScheduleView.as_view(), name='bank-schedule'),
 ]
 # noqa: end of url patterns
@@ -1,148 +1,138 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework import status
+"""Proxy views for the AI service.
+
+These are async Django views rather than DRF APIViews (which only run
+synchronously): under ASGI (core/asgi.py) a slow LLM call then waits on the
+event loop instead of holding a worker, and every call goes through the
+pooled client in transaction/ai_client.py. Authentication is the same JWT
+check DRF performs, and errors keep the API's ``{'detail': ...}`` shape.
+"""
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+import httpx
+
+from core.exceptions import format_error
 from core.ratelimit import ratelimit
-import requests
+from core.renderers import dumps, loads
+from .. import ai_client
+from ..services import TransactionService
 
 
-class AIAdviceView(APIView):
-    permission_classes = [IsAuthenticated]
+# Transaction keys the AI service's advice model accepts.
+AI_TX_FIELDS = ('type', 'amount', 'category', 'description', 'created_at')
+JSON_HEADERS = {'Content-Type': 'application/json'}
+ADVICE_TIMEOUT = 30
+TRANSCRIBE_TIMEOUT = 120
 
-    def get(self, request):
-        # Mirror POST but without prompt in body
-        if not settings.AI_FEATURES_ENABLED:
-            return Response(
-                {'detail': 'ai_disabled'},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
-        try:
-            user_id = request.user.id
-            from ..models import Transaction as Tx
-            txs = list(
-                Tx.objects(user_id=user_id).order_by('-created_at')[:50]
-            )
-            payload = {
-                'transactions': [
-                    {
-                        'type': t.type,
-                        'amount': float(t.amount),
-                        'category': t.category,
-                        'description': getattr(t, 'description', ''),
-                        'created_at': (
-                            t.created_at.isoformat()
-                            if getattr(t, 'created_at', None) else None
-                        ),
-                    }
-                    for t in txs
-                ],
-                'prompt': '',
-            }
-        except Exception:
-            return Response(
-                {'detail': 'database_unavailable'},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+_jwt = JWTAuthentication()
+
+
+def _json(data, status_code: int = status.HTTP_200_OK, headers=None) -> HttpResponse:
+    return HttpResponse(
+        dumps(data), status=status_code, content_type='application/json', headers=headers
+    )
+
+
+def _detail(code: str, status_code: int) -> HttpResponse:
+    return _json({'detail': code}, status_code)
+
+
+def advice_payload(user_id: int, prompt: str = '') -> dict:
+    """Request body for /advice: the user's 50 latest transactions."""
+    rows = TransactionService.recent_api_rows(user_id, 50)
+    return {
+        'transactions': [{k: r[k] for k in AI_TX_FIELDS} for r in rows],
+        'prompt': prompt or '',
+    }
+
+
+async def _forward(path: str, read_timeout: float, **kwargs) -> HttpResponse:
+    """POST to the AI service and relay its JSON answer."""
+    try:
+        async with ai_client.session() as client:
+            r = await client.post(path, timeout=ai_client.timeout(read_timeout), **kwargs)
+    except httpx.PoolTimeout:
+        # Every pooled connection is busy with other AI calls
+        return _detail('ai_busy', status.HTTP_503_SERVICE_UNAVAILABLE)
+    except httpx.HTTPError:
+        return _detail('ai_unreachable', status.HTTP_502_BAD_GATEWAY)
+    if r.status_code != 200:
+        return _detail('ai_error', status.HTTP_502_BAD_GATEWAY)
+    try:
+        return _json(r.json())
+    except ValueError:
+        return _detail('ai_unreachable', status.HTTP_502_BAD_GATEWAY)
+
+
+class AIView(View):
+    """Async base: JWT authentication, CSRF exemption and the feature flag."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # bearer tokens, no cookies (as DRF's APIView)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
         try:
-            url = settings.AI_SERVICE_URL.rstrip('/') + '/advice'
-            r = requests.post(url, json=payload, timeout=30)
-            if r.status_code != 200:
-                return Response(
-                    {'detail': 'ai_error'},
-                    status=status.HTTP_502_BAD_GATEWAY,
-                )
-            return Response(r.json(), status=status.HTTP_200_OK)
-        except Exception:
-            return Response(
-                {'detail': 'ai_unreachable'},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
+            auth = await sync_to_async(_jwt.authenticate)(request)
+        except AuthenticationFailed as exc:
+            return self._unauthorized(request, str(exc.detail))
+        if auth is None:
+            return self._unauthorized(request, 'Authentication credentials were not provided.')
+        request.user = auth[0]
+        if not settings.AI_FEATURES_ENABLED:
+            return _detail('ai_disabled', status.HTTP_503_SERVICE_UNAVAILABLE)
+        return await super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def _unauthorized(request, message: str) -> HttpResponse:
+        return _json(
+            format_error('error', message, request=request),
+            status.HTTP_401_UNAUTHORIZED,
+            headers={'WWW-Authenticate': _jwt.authenticate_header(request)},
+        )
+
+
+class AIAdviceView(AIView):
+    async def get(self, request):
+        # Same as POST, without a prompt
+        return await self._advice(request, '')
 
     @ratelimit(key='ip', rate='20/m', block=True)
-    def post(self, request):
-        if not settings.AI_FEATURES_ENABLED:
-            return Response(
-                {'detail': 'ai_disabled'},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+    async def post(self, request):
         try:
-            user_id = request.user.id
-            from ..models import Transaction as Tx
-            txs = list(
-                Tx.objects(user_id=user_id).order_by('-created_at')[:50]
-            )
-            payload = {
-                'transactions': [
-                    {
-                        'type': t.type,
-                        'amount': float(t.amount),
-                        'category': t.category,
-                        'description': getattr(t, 'description', ''),
-                        'created_at': (
-                            t.created_at.isoformat()
-                            if getattr(t, 'created_at', None) else None
-                        ),
-                    }
-                    for t in txs
-                ],
-                'prompt': request.data.get('prompt') or ''
-            }
-        except Exception:
-            return Response(
-                {'detail': 'database_unavailable'},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+            body = loads(request.body) if request.body else {}
+        except ValueError:
+            return _detail('invalid_json', status.HTTP_400_BAD_REQUEST)
+        prompt = body.get('prompt') if isinstance(body, dict) else None
+        return await self._advice(request, prompt or '')
+
+    async def _advice(self, request, prompt: str) -> HttpResponse:
         try:
-            url = settings.AI_SERVICE_URL.rstrip('/') + '/advice'
-            r = requests.post(url, json=payload, timeout=30)
-            if r.status_code != 200:
-                return Response(
-                    {'detail': 'ai_error'},
-                    status=status.HTTP_502_BAD_GATEWAY,
-                )
-            return Response(r.json(), status=status.HTTP_200_OK)
+            payload = await sync_to_async(advice_payload)(request.user.id, prompt)
         except Exception:
-            return Response(
-                {'detail': 'ai_unreachable'},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
-
+            return _detail('database_unavailable', status.HTTP_503_SERVICE_UNAVAILABLE)
+        return await _forward(
+            '/advice', ADVICE_TIMEOUT, content=dumps(payload), headers=JSON_HEADERS
+        )
 
-class AITranscribeView(APIView):
-    permission_classes = [IsAuthenticated]
 
+class AITranscribeView(AIView):
     @ratelimit(key='ip', rate='10/m', block=True)
-    def post(self, request):
-        if not settings.AI_FEATURES_ENABLED:
-            return Response(
-                {'detail': 'ai_disabled'},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+    async def post(self, request):
         audio = request.FILES.get('audio')
         if not audio:
-            return Response(
-                {'detail': 'audio_required'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        try:
-            url = settings.AI_SERVICE_URL.rstrip('/') + '/transcribe'
-            files = {
-                'audio': (
-                    audio.name,
-                    audio.read(),
-                    audio.content_type or 'application/octet-stream',
-                )
-            }
-            r = requests.post(url, files=files, timeout=120)
-            if r.status_code != 200:
-                return Response(
-                    {'detail': 'ai_error'},
-                    status=status.HTTP_502_BAD_GATEWAY,
-                )
-            return Response(r.json(), status=status.HTTP_200_OK)
-        except Exception:
-            return Response(
-                {'detail': 'ai_unreachable'},
-                status=status.HTTP_502_BAD_GATEWAY,
+            return _detail('audio_required', status.HTTP_400_BAD_REQUEST)
+        files = {
+            'audio': (
+                audio.name,
+                audio.read(),
+                audio.content_type or 'application/octet-stream',
             )
+        }
+        return await _forward('/transcribe', TRANSCRIBE_TIMEOUT, files=files)
@@ -1,36 +1,39 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
 from datetime import datetime, timedelta
+from django.conf import settings
+from mongoengine.errors import ValidationError
 
+from .. import webhooks
+from ..caching import invalidate_user
+from ..etags import conditional
 from ..models import BankConnection, BankSyncSchedule
+from ..providers import PROVIDERS, PushProvider, get_provider
+from ..services import BankSyncJobService, BankSyncService, BankWebhookService
 from ..serializers import (
     BankProviderSerializer,
     BankConnectionSerializer,
+    BankSyncJobSerializer,
     BankSyncScheduleSerializer,
 )
 
 
-# Static providers for now; can be extended later to real integrations.
-STATIC_PROVIDERS = [
-    {"id": "mockbank", "name": "Mock Bank"},
-    {"id": "monobank", "name": "Monobank"},
-    {"id": "privatbank", "name": "PrivatBank"},
-]
-
-
 class BankProvidersView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        ser = BankProviderSerializer(STATIC_PROVIDERS, many=True)
+        ser = BankProviderSerializer(
+            [p.describe() for p in PROVIDERS.values()], many=True
+        )
         return Response({"providers": ser.data})
 
 
 class BankConnectionsView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional('bank_connections')
     def get(self, request):
         try:
             conns = BankConnection.objects(user_id=request.user.id)
@@ -38,7 +41,7 @@ class BankConnectionsView(APIView):
             return Response({"connections": ser.data})
         except Exception:
             # If DB is unavailable during tests/local runs, return empty list
-            return Response({"connections": []})
+            return Response({"connections": []}, headers={"Cache-Control": "no-store"})
 
 
 class BankStartConnectView(APIView):
@@ -48,7 +51,7 @@ class BankStartConnectView(APIView):
         provider_id = (request.data or {}).get("providerId")
         if not provider_id:
             return Response({"message": "providerId required"}, status=status.HTTP_400_BAD_REQUEST)
-        prov = next((p for p in STATIC_PROVIDERS if p["id"] == provider_id), None)
+        prov = get_provider(provider_id)
         if not prov:
             return Response({"message": "unknown provider"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -56,12 +59,13 @@ class BankStartConnectView(APIView):
         try:
             conn = BankConnection(
                 user_id=request.user.id,
-                provider_id=prov["id"],
-                provider_name=prov["name"],
+                provider_id=prov.id,
+                provider_name=prov.name,
                 status="connected",  # assume immediate connect for mock
                 last_synced_at=None,
             )
             conn.save()
+            invalidate_user(request.user.id)
             cid = str(conn.id)
         except Exception:
             # Fallback without DB: generate ephemeral id
@@ -81,26 +85,98 @@ class BankDisconnectView(APIView):
                 return Response(status=status.HTTP_404_NOT_FOUND)
             conn.status = "disconnected"
             conn.save()
+            invalidate_user(request.user.id)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Exception:
             return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class BankSyncNowView(APIView):
+    """Queue a sync of one connection; bank_sync_worker runs it. Poll the
+    returned job at /api/bank/sync-jobs/<jobId>."""
     permission_classes = [IsAuthenticated]
 
     def post(self, request, connection_id: str):
         try:
             conn = BankConnection.objects(id=connection_id, user_id=request.user.id).first()
-            if not conn:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            # Simulate sync
-            conn.last_synced_at = datetime.utcnow()
-            conn.status = "connected"
-            conn.save()
-            return Response({"started": True})
+        except ValidationError:
+            conn = None  # malformed id
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if not conn or conn.status == "disconnected":
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        try:
+            job, created = BankSyncJobService.enqueue(conn)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        # An already queued/running job is returned instead of a second one
+        return Response(
+            {"started": True, "jobId": str(job["_id"]), "status": job["status"]},
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        )
+
+
+class BankSyncJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id: str):
+        try:
+            job = BankSyncJobService.get(request.user.id, job_id)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if job is None:
+            return Response({'detail': 'not_found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {"job": BankSyncJobSerializer(job).data},
+            headers={"Cache-Control": "no-store"},
+        )
+
+
+class BankWebhookView(APIView):
+    """Push endpoint of a provider: verify, buffer and acknowledge. Nothing
+    touches Mongo here; bank_webhook_worker applies the events in batches.
+    Without a queue shared with the worker (no Redis) the delivery is applied
+    inline instead, so nothing is acknowledged that could never be applied."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, provider_id: str):
+        if not isinstance(get_provider(provider_id), PushProvider):
+            return Response({'detail': 'not_found'}, status=status.HTTP_404_NOT_FOUND)
+        if not webhooks.verify(provider_id, request.body, request.headers.get('X-Signature', '')):
+            return Response({'detail': 'invalid_signature'}, status=status.HTTP_401_UNAUTHORIZED)
+        events = request.data.get('events') if isinstance(request.data, dict) else None
+        if not isinstance(events, list) or not events:
+            return Response({'detail': 'invalid_events'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > settings.BANK_WEBHOOK_MAX_EVENTS:
+            return Response({'detail': 'too_many_events'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            shared = webhooks.get_queue().shared
+            if shared:
+                webhooks.enqueue(provider_id, events)
         except Exception:
-            return Response({"started": True})
+            # Not acknowledged: the provider retries the delivery
+            return Response(
+                {'detail': 'queue_unavailable'}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if shared:
+            return Response({'accepted': len(events)}, status=status.HTTP_202_ACCEPTED)
+        try:
+            BankWebhookService.ingest([{'provider': provider_id, 'events': events}])
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response({'accepted': len(events)}, status=status.HTTP_200_OK)
 
 
 def _get_or_create_schedule(user_id: int) -> BankSyncSchedule | None:
@@ -131,7 +207,16 @@ class BankScheduleView(APIView):
 
     def post(self, request):
         enabled = bool((request.data or {}).get("enabled", False))
-        interval_hours = int((request.data or {}).get("intervalHours", 2))
+        try:
+            interval_hours = int((request.data or {}).get("intervalHours", 2))
+        except (TypeError, ValueError):
+            interval_hours = 0
+        low, high = BankSyncService.MIN_INTERVAL_HOURS, BankSyncService.MAX_INTERVAL_HOURS
+        if not low <= interval_hours <= high:
+            return Response(
+                {"message": f"intervalHours must be between {low} and {high}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         sched = _get_or_create_schedule(request.user.id)
         if not sched:
             next_run = (
@@ -147,9 +232,10 @@ class BankScheduleView(APIView):
             })
         sched.enabled = 1 if enabled else 0
         sched.interval_hours = interval_hours
-        # naive next run
-        sched.next_run_at = datetime.utcnow() + timedelta(hours=interval_hours) if enabled else None
+        # Jittered so schedules saved together do not all come due at once
+        sched.next_run_at = BankSyncService.next_run_at(interval_hours) if enabled else None
         sched.save()
+        invalidate_user(request.user.id)
 
         ser = BankSyncScheduleSerializer(sched)
         data = ser.data
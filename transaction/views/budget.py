@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..etags import conditional
+from ..models import Budget
+from ..serializers import BudgetSerializer
+from ..services import BudgetService
+
+
+def _month(request) -> str:
+    """``?month=YYYY-MM``, defaulting to the current (UTC) month."""
+    value = request.query_params.get('month')
+    if not value:
+        return datetime.utcnow().strftime('%Y-%m')
+    try:
+        return datetime.strptime(value, '%Y-%m').strftime('%Y-%m')
+    except ValueError:
+        raise ValueError('invalid_month')
+
+
+def _current_month(request) -> str:
+    # The default month rolls over without any write: part of the ETag
+    return datetime.utcnow().strftime('%Y-%m')
+
+
+class BudgetsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @conditional('budgets', context=_current_month)
+    def get(self, request):
+        try:
+            month = _month(request)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            items = BudgetService.user_budgets(request.user.id, month)
+            return Response({'items': items})
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+    def post(self, request):
+        """Create or replace the monthly limit of a category."""
+        serializer = BudgetSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        try:
+            budget = BudgetService.set_budget(
+                request.user.id, category=data['category'], limit=data['limit']
+            )
+            month = datetime.utcnow().strftime('%Y-%m')
+            spent = BudgetService.spent(request.user.id, month, [budget.category])
+            body = BudgetService.status(
+                {'category': budget.category, 'limit_cents': budget.limit_cents},
+                spent.get(budget.category, 0),
+                month,
+            )
+            return Response(body, status=status.HTTP_200_OK)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+
+class BudgetDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, category: str):
+        """Spend against one budget: two point lookups, no aggregation."""
+        try:
+            month = _month(request)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            budget = Budget.objects(
+                user_id=request.user.id, category=category
+            ).only('category', 'limit_cents').as_pymongo().first()
+            if budget is None:
+                return Response({'detail': 'not_found'}, status=status.HTTP_404_NOT_FOUND)
+            spent = BudgetService.spent(request.user.id, month, [category])
+            return Response(BudgetService.status(budget, spent.get(category, 0), month))
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+    def delete(self, request, category: str):
+        try:
+            if not BudgetService.delete_budget(request.user.id, category):
+                return Response({'detail': 'not_found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
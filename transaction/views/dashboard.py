@@ -0,0 +1,71 @@
+"""Dashboard: everything the frontend's first screen needs in one request.
+
+The sections are independent reads, so they run concurrently on a shared
+thread pool and the response takes about as long as the slowest of them.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..etags import conditional
+from ..models import BankConnection
+from ..serializers import BankConnectionSerializer, GoalSerializer
+from ..services import GoalService, TransactionService
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DASHBOARD_THREADS, thread_name_prefix='dashboard'
+)
+
+
+def _transactions(user_id: int) -> dict:
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+    qs = TransactionService.list_user_transactions_filtered(user_id=user_id)
+    items, total = TransactionService.page_with_total(
+        qs, start=0, limit=page_size, count_cap=settings.TRANSACTIONS_COUNT_CAP
+    )
+    return {'items': items, 'total': total}
+
+
+def _goals(user_id: int) -> list:
+    return GoalSerializer(GoalService.list_user_goals(user_id), many=True).data
+
+
+def _bank_connections(user_id: int) -> list:
+    conns = BankConnection.objects(user_id=user_id)
+    return BankConnectionSerializer(conns, many=True).data
+
+
+SECTIONS = {
+    'summary': TransactionService.user_summary,
+    'transactions': _transactions,
+    'goals': _goals,
+    'connections': _bank_connections,
+}
+
+
+class DashboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @conditional('dashboard')
+    def get(self, request):
+        u = request.user
+        futures = {
+            name: _executor.submit(fetch, u.id) for name, fetch in SECTIONS.items()
+        }
+        data = {'user': {'id': u.id, 'username': u.username, 'email': u.email}}
+        errors = []
+        for name, future in futures.items():
+            try:
+                data[name] = future.result()
+            except Exception:
+                # One failing read must not blank the whole dashboard
+                data[name] = None
+                errors.append(name)
+        if errors:
+            data['errors'] = errors
+            # Partial payload: never tagged or cached
+            return Response(data, headers={'Cache-Control': 'no-store'})
+        return Response(data)
@@ -1,10 +1,23 @@
 from rest_framework import viewsets, status, mixins
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from ..serializers import GoalSerializer
+from rest_framework.decorators import action
+from datetime import datetime
+from .. import forecast
+from ..serializers import GoalContributionSerializer, GoalSerializer
+from ..etags import conditional
 from ..services import GoalService
 
 
+def _includes(request) -> list[str]:
+    return (request.query_params.get('include') or '').split(',')
+
+
+def _forecast_day(request) -> str:
+    # Forecasts are relative to today, which changes without any write
+    return datetime.utcnow().date().isoformat() if 'forecast' in _includes(request) else ''
+
+
 class GoalViewSet(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -17,11 +30,19 @@ class GoalViewSet(
         user_id = self.request.user.id
         return GoalService.list_user_goals(user_id)
 
+    @conditional('goals', context=_forecast_day)
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response({'items': serializer.data})
+            goals = list(self.get_queryset())
+            items = self.get_serializer(goals, many=True).data
+            if 'forecast' in _includes(request):
+                today = datetime.utcnow().date()
+                rate = forecast.savings_rate(forecast.monthly_net(request.user.id, today))
+                for item, projection in zip(
+                    items, forecast.forecast_goals(goals, rate, today)
+                ):
+                    item['forecast'] = projection
+            return Response({'items': items})
         except Exception:
             return Response(
                 {'detail': 'database_unavailable'},
@@ -41,6 +62,7 @@ class GoalViewSet(
                 due_date=data.get('due_date'),
                 description=data.get('description') or '',
                 image=data.get('image') or '/vercel.svg',
+                category=data.get('category') or None,
             )
             return Response({'id': str(instance.id)}, status=status.HTTP_201_CREATED)
         except Exception:
@@ -48,3 +70,22 @@ class GoalViewSet(
                 {'detail': 'database_unavailable'},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
+
+    @action(detail=True, methods=['post'], url_path='contribute')
+    def contribute(self, request, pk=None):
+        """Atomically add ``amount`` to the goal's progress."""
+        serializer = GoalContributionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'detail': 'invalid_amount'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            goal = GoalService.contribute(
+                request.user.id, pk, serializer.validated_data['amount']
+            )
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if goal is None:
+            return Response({'detail': 'not_found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(GoalSerializer(goal).data)
@@ -3,10 +3,19 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from ..serializers import TransactionSerializer
-from ..services import TransactionService
+from ..caching import data_version, record_hit
+from ..etags import conditional
+from ..exporters import EXPORT_FORMATS, encode as encode_export
+from ..importers import IMPORT_FORMATS, import_statement
+from .. import suggestions
+from ..services import AnalyticsService, TransactionService, COUNT_MODES, encode_cursor
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
 from datetime import datetime, time
 from decimal import Decimal, InvalidOperation
+import hashlib
+import itertools
 import math
 
 
@@ -30,10 +39,9 @@ class TransactionViewSet(
         except ValueError:
             raise ValueError('invalid_date')
 
-    def get_queryset(self):  # now uses filters
-        qp = self.request.query_params
-        user_id = self.request.user.id
-
+    def _filters(self, qp) -> dict:
+        """Validated list filters as keyword arguments for
+        ``TransactionService.list_user_transactions_filtered``."""
         date_from = None
         date_to = None
         if qp.get('date_from'):
@@ -64,68 +72,196 @@ class TransactionViewSet(
             except (InvalidOperation, ValueError):
                 raise ValueError('invalid_max_amount')
 
-        return TransactionService.list_user_transactions_filtered(
-            user_id=user_id,
-            date_from=date_from,
-            date_to=date_to,
-            categories=categories,
-            type_=type_,
-            min_amount=min_amount,
-            max_amount=max_amount,
-        )
-
-    def list(self, request, *args, **kwargs):
-        try:
-            queryset = self.get_queryset()
-        except ValueError as e:  # parameter validation error
-            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception:
-            # Graceful degradation: if database is unreachable return empty list
-            # instead of 503. This keeps the endpoint usable for the UI (and
-            # test suite) even if Mongo temporarily down. A monitoring/health
-            # endpoint still surfaces the real issue.
-            return Response({'items': []})
+        search = (qp.get('q') or '').strip() or None
+        if search and len(search) > 100:
+            raise ValueError('invalid_q')
 
-        # Manual lightweight pagination to preserve legacy {'items': []} shape
-        # Support both MongoEngine QuerySet (has count, slicing) and plain list (tests)
-        if hasattr(queryset, 'count'):
-            try:
-                total = queryset.count()
-            except Exception:
-                return Response({'items': []})
-        else:  # list-like
-            queryset = list(queryset)
-            total = len(queryset)
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'categories': categories,
+            'type_': type_,
+            'min_amount': min_amount,
+            'max_amount': max_amount,
+            'search': search,
+        }
 
-        qp = request.query_params
-        try:
-            page = int(qp.get('page', '1'))
-            if page < 1:
-                raise ValueError
-        except ValueError:
-            return Response({'detail': 'invalid_page'}, status=status.HTTP_400_BAD_REQUEST)
+    def get_queryset(self):  # now uses filters
+        return TransactionService.list_user_transactions_filtered(
+            user_id=self.request.user.id, **self._filters(self.request.query_params)
+        )
 
+    def _page_size(self, qp) -> int:
         default_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
         try:
             page_size = int(qp.get('page_size', str(default_size)))
             if page_size < 1 or page_size > 100:
                 raise ValueError
         except ValueError:
-            return Response({'detail': 'invalid_page_size'}, status=status.HTTP_400_BAD_REQUEST)
+            raise ValueError('invalid_page_size')
+        return page_size
+
+    def _rows(self, queryset, start: int, stop: int) -> list[dict]:
+        """Slice ``queryset`` into API dicts.
+
+        MongoEngine querysets take the raw projected fast path; plain
+        list-likes (tests) still go through the serializer.
+        """
+        if hasattr(queryset, 'as_pymongo'):
+            return TransactionService.api_rows(queryset, start, stop)
+        return self.get_serializer(list(queryset[start:stop]), many=True).data
+
+    def _list_cursor(self, queryset, cursor: str, page_size: int):
+        """Keyset pagination: seek past ``cursor`` and fetch one extra row
+        to learn whether another page exists. No count() is issued."""
+        if cursor:
+            queryset = TransactionService.seek_after(queryset, cursor)
+        rows = self._rows(queryset, 0, page_size + 1)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                datetime.fromisoformat(last['created_at']), last['id']
+            )
+        return {'items': rows, 'next_cursor': next_cursor}
 
+    def _list_offset(self, queryset, page: int, page_size: int, count_mode: str):
+        """Legacy page-number pagination.
+
+        ``count_mode`` picks how ``pagination.total`` is obtained: ``exact``
+        (only when asked for) runs page and count in one $facet,
+        ``estimated`` (the default) counts up to TRANSACTIONS_COUNT_CAP
+        with an index-backed count, ``none`` skips it and reports
+        ``has_next``.
+        """
         start = (page - 1) * page_size
         end = start + page_size
-        items_qs = queryset[start:end]
-        serializer = self.get_serializer(items_qs, many=True)
-        response = {'items': serializer.data}
-        if total > page_size:
+        total = None
+        estimated = False
+        if count_mode == 'none':
+            rows = self._rows(queryset, start, end + 1)
+            has_next = len(rows) > page_size
+            items = rows[:page_size]
+        elif hasattr(queryset, 'aggregate'):
+            cap = None
+            if count_mode == 'estimated':
+                # Never cap below the current page so page math stays sane
+                cap = max(settings.TRANSACTIONS_COUNT_CAP, end + 1)
+            items, total = TransactionService.page_with_total(
+                queryset, start=start, limit=page_size, count_cap=cap
+            )
+            estimated = cap is not None and total >= cap
+        else:
+            # Support both MongoEngine QuerySet and plain list-likes (tests)
+            if hasattr(queryset, 'count'):
+                total = queryset.count()
+            else:
+                queryset = list(queryset)
+                total = len(queryset)
+            items = self._rows(queryset, start, end)
+
+        response = {'items': items}
+        if total is None:
+            if has_next or page > 1:
+                response['pagination'] = {
+                    'page': page,
+                    'page_size': page_size,
+                    'has_next': has_next,
+                }
+        elif total > page_size:
             response['pagination'] = {
                 'page': page,
                 'page_size': page_size,
                 'total': total,
+                # True when counting stopped at the cap: total is a lower bound
+                'total_is_estimate': estimated,
                 'pages': math.ceil(total / page_size),
             }
-        return Response(response)
+        return response
+
+    def _page_cache_key(self, filters: dict, paging: tuple) -> str | None:
+        """Cache key of one rendered list page, or None when page caching is
+        off or the cache is unreachable. The data version makes any write
+        skip every page cached before it."""
+        if not settings.TRANSACTIONS_PAGE_CACHE_TTL:
+            return None
+        user_id = self.request.user.id
+        raw = repr((sorted(filters.items()), paging))
+        digest = hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+        try:
+            return f"tx_page:{user_id}:{data_version(user_id)}:{digest}"
+        except Exception:  # cache backend down
+            return None
+
+    def _rendered(self, body: bytes) -> HttpResponse:
+        return HttpResponse(body, content_type=self.renderer_classes[0].media_type)
+
+    @conditional('transactions')
+    def list(self, request, *args, **kwargs):
+        qp = request.query_params
+        try:
+            filters = self._filters(qp)
+            page_size = self._page_size(qp)
+            # Presence of ``cursor`` (even empty, for the first page) selects
+            # keyset mode; otherwise fall back to legacy page numbers.
+            if 'cursor' in qp:
+                if filters['search']:
+                    # Keyset cursors follow (created_at, _id), not relevance
+                    raise ValueError('cursor_unsupported_with_q')
+                paging = ('cursor', qp.get('cursor', ''), page_size)
+            else:
+                try:
+                    page = int(qp.get('page', '1'))
+                    if page < 1:
+                        raise ValueError
+                except ValueError:
+                    raise ValueError('invalid_page')
+                count_mode = qp.get('count') or 'estimated'
+                if count_mode not in COUNT_MODES:
+                    raise ValueError('invalid_count')
+                paging = ('page', page, page_size, count_mode)
+        except ValueError as e:  # parameter validation error
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Rendered JSON pages are cached as bytes: a hit skips Mongo and
+        # rendering. Other negotiated formats (browsable API) are not cached.
+        json_page = isinstance(request.accepted_renderer, self.renderer_classes[0])
+        cache_key = self._page_cache_key(filters, paging) if json_page else None
+        if cache_key:
+            try:
+                body = cache.get(cache_key)
+            except Exception:  # cache backend down
+                body = None
+            record_hit('tx_page', body is not None)
+            if body is not None:
+                return self._rendered(body)
+
+        try:
+            queryset = self.get_queryset()
+            if paging[0] == 'cursor':
+                data = self._list_cursor(queryset, paging[1], page_size)
+            else:
+                data = self._list_offset(queryset, page, page_size, count_mode)
+        except ValueError as e:  # e.g. invalid_cursor
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            # Graceful degradation: if database is unreachable return empty list
+            # instead of 503. This keeps the endpoint usable for the UI (and
+            # test suite) even if Mongo temporarily down. A monitoring/health
+            # endpoint still surfaces the real issue. Never cached or tagged.
+            return Response({'items': []}, headers={'Cache-Control': 'no-store'})
+
+        if not json_page:
+            return Response(data)
+        body = self.renderer_classes[0]().render(data)
+        if cache_key:
+            try:
+                cache.set(cache_key, body, settings.TRANSACTIONS_PAGE_CACHE_TTL)
+            except Exception:  # pragma: no cover - defensive
+                pass
+        return self._rendered(body)
 
     def create(self, request, *args, **kwargs):
         try:
@@ -147,7 +283,175 @@ class TransactionViewSet(
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Create many transactions in one request.
+
+        Accepts a JSON list (or ``{"items": [...]}``) and reports a result
+        per item; invalid items are skipped while the valid ones are written.
+        """
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get('items')
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'items_required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.TRANSACTIONS_BULK_MAX_ITEMS:
+            return Response({'detail': 'too_many_items'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=items, many=True)
+        if serializer.is_valid():
+            errors = [{}] * len(items)
+            valid = list(enumerate(serializer.validated_data))
+        else:
+            # ListSerializer drops all validated data on any error; re-run the
+            # child for the rows that passed to keep partial success.
+            errors = serializer.errors
+            child = serializer.child
+            valid = [
+                (i, child.run_validation(items[i]))
+                for i, err in enumerate(errors) if not err
+            ]
+
+        try:
+            ids = TransactionService.bulk_create_transactions(
+                request.user.id, [row for _, row in valid]
+            )
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        results = [
+            {'index': i, 'status': 'error', 'errors': err}
+            for i, err in enumerate(errors)
+        ]
+        for (i, _), obj_id in zip(valid, ids):
+            if obj_id is None:
+                results[i]['errors'] = {'detail': 'write_failed'}
+            else:
+                results[i] = {'index': i, 'status': 'created', 'id': str(obj_id)}
+        created = sum(1 for r in results if r['status'] == 'created')
+        if created == len(results):
+            code = status.HTTP_201_CREATED
+        elif created:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'created': created, 'failed': len(results) - created, 'results': results},
+            status=code,
+        )
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_statement(self, request):
+        """Import a CSV/OFX bank statement uploaded as multipart ``file``.
+
+        Rows already imported from the same statement are reported as
+        duplicates rather than stored again.
+        """
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'detail': 'file_required'}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = (request.data.get('fmt') or upload.name.rsplit('.', 1)[-1]).lower()
+        if fmt not in IMPORT_FORMATS:
+            return Response({'detail': 'invalid_fmt'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            report = import_statement(request.user.id, upload, fmt)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(report)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream every transaction matching the list filters as CSV/NDJSON.
+
+        ``fmt`` selects the encoding (``format`` is taken by DRF's content
+        negotiation); ``gzip=1`` compresses the stream on the fly.
+        """
+        qp = request.query_params
+        fmt = qp.get('fmt') or 'csv'
+        if fmt not in EXPORT_FORMATS:
+            return Response({'detail': 'invalid_fmt'}, status=status.HTTP_400_BAD_REQUEST)
+        use_gzip = qp.get('gzip') in ('1', 'true')
+        try:
+            queryset = self.get_queryset()
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = TransactionService.iter_api_rows(queryset)
+            # Pull the first row eagerly so a Mongo outage becomes a 503
+            # instead of a stream that breaks after the headers went out.
+            first = next(rows, None)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if first is not None:
+            rows = itertools.chain([first], rows)
+        content_type, ext = EXPORT_FORMATS[fmt]
+        filename = f'transactions.{ext}'
+        if use_gzip:
+            content_type, filename = 'application/gzip', filename + '.gz'
+        response = StreamingHttpResponse(
+            encode_export(rows, fmt, gzip=use_gzip), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='analytics')
+    def analytics(self, request):
+        """Totals by category, by month and by category per month, plus the
+        top expense categories, for an optional date range."""
+        qp = request.query_params
+        try:
+            date_from = self._parse_date(qp['date_from']) if qp.get('date_from') else None
+            date_to = self._parse_date(qp['date_to'], end=True) if qp.get('date_to') else None
+            top = int(qp.get('top', '5'))
+            if top < 1 or top > 50:
+                raise ValueError('invalid_top')
+        except ValueError as e:
+            detail = str(e) if str(e).startswith('invalid_') else 'invalid_top'
+            return Response({'detail': detail}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = AnalyticsService.breakdown(
+                request.user.id, date_from=date_from, date_to=date_to, top=top
+            )
+            return Response(data)
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+    @action(detail=False, methods=['get'], url_path='categories')
+    def categories(self, request):
+        """Categories the user already uses, for autocomplete: optional
+        ``prefix`` (case-insensitive), ranked by frequency and recency."""
+        qp = request.query_params
+        try:
+            limit = int(qp.get('limit', '10'))
+            if limit < 1 or limit > 50:
+                raise ValueError
+        except ValueError:
+            return Response({'detail': 'invalid_limit'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            items = suggestions.suggest(
+                request.user.id, (qp.get('prefix') or '').strip(), limit
+            )
+            return Response({'items': items})
+        except Exception:
+            return Response(
+                {'detail': 'database_unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
     @action(detail=False, methods=['get'], url_path='summary')
+    @conditional('summary')
     def summary(self, request):
         try:
             data = TransactionService.user_summary(request.user.id)
@@ -0,0 +1,231 @@
+"""Bank webhook ingestion: signature checks and the event buffer.
+
+The webhook view only verifies the signature and appends the request's
+events to a queue as one item, so a push costs a single queue write and no
+Mongo access. ``bank_webhook_worker`` pops many items at a time and applies
+them with BankWebhookService.ingest (bulk upserts, one connection update and
+one invalidation per user per batch). Deliveries that keep failing are
+retried at the tail of the queue and, after ``BANK_WEBHOOK_MAX_ATTEMPTS``,
+moved to a dead-letter queue, so one bad delivery never blocks the rest.
+
+The queue is a Redis list when the cache is Redis (shared by all processes).
+Workers claim deliveries by moving them to a processing list of their own and
+drop that list only once the deliveries are handled, so a crashed worker loses
+nothing: its items are requeued when a worker starts. Without Redis there is
+no queue shared with the worker process, so the webhook view applies
+deliveries inline; the in-process deque then only serves tests.
+"""
+from __future__ import annotations
+from collections import deque
+from datetime import datetime
+import hashlib
+import hmac
+import os
+import socket
+import threading
+
+from django.conf import settings
+
+from core.renderers import dumps, loads
+
+QUEUE_KEY = 'bank_webhook_events'
+DEAD_LETTER_KEY = 'bank_webhook_dead'
+
+
+def sign(secret: str, body: bytes) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify(provider_id: str, body: bytes, signature: str) -> bool:
+    """Constant-time check of ``X-Signature`` against the provider's secret."""
+    secret = settings.BANK_WEBHOOK_SECRETS.get(provider_id)
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature)
+
+
+# Move up to ARGV[1] items from the queue to the worker's processing list
+CLAIM_SCRIPT = """
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+  local item = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+  if not item then break end
+  items[#items + 1] = item
+end
+return items
+"""
+# Put a processing list back at the head of the queue, oldest item first
+RESTORE_SCRIPT = """
+local n = 0
+while redis.call('LMOVE', KEYS[2], KEYS[1], 'RIGHT', 'LEFT') do n = n + 1 end
+return n
+"""
+WORKER_TTL = 300  # seconds without a heartbeat before a worker's items are requeued
+
+
+def worker_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class LocalQueue:
+    """In-process queue for tests. It is not ``shared``: the worker process
+    never sees its items, so the webhook view must not enqueue into it."""
+    shared = False
+
+    def __init__(self):
+        self._items: deque[bytes] = deque()
+        self._processing: dict[str, list[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def push(self, item: bytes) -> None:
+        self._items.append(item)
+
+    def claim(self, count: int, worker: str) -> list[bytes]:
+        with self._lock:
+            items = [self._items.popleft() for _ in range(min(count, len(self._items)))]
+            self._processing.setdefault(worker, []).extend(items)
+            return items
+
+    def ack(self, worker: str) -> None:
+        with self._lock:
+            self._processing.pop(worker, None)
+
+    def heartbeat(self, worker: str) -> None:
+        pass
+
+    def recover(self, worker: str) -> int:
+        with self._lock:
+            items = self._processing.pop(worker, [])
+            self._items.extendleft(reversed(items))
+            return len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RedisQueue:
+    """Reliable Redis list: ``claim`` atomically moves items to a processing
+    list of the worker, which ``ack`` drops once they are handled. Items of a
+    worker whose heartbeat expired go back to the queue on ``recover``."""
+    shared = True
+
+    def __init__(self, key: str):
+        from django_redis import get_redis_connection
+
+        self._redis = get_redis_connection('default')
+        self._key = key
+        self._claim = self._redis.register_script(CLAIM_SCRIPT)
+        self._restore = self._redis.register_script(RESTORE_SCRIPT)
+
+    def _processing(self, worker: str) -> str:
+        return f'{self._key}:processing:{worker}'
+
+    def _alive(self, worker: str) -> str:
+        return f'{self._key}:alive:{worker}'
+
+    def push(self, item: bytes) -> None:
+        self._redis.rpush(self._key, item)
+
+    def claim(self, count: int, worker: str) -> list[bytes]:
+        return self._claim(keys=[self._key, self._processing(worker)], args=[count])
+
+    def ack(self, worker: str) -> None:
+        self._redis.delete(self._processing(worker))
+
+    def heartbeat(self, worker: str) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.sadd(f'{self._key}:workers', worker)
+        pipe.set(self._alive(worker), 1, ex=WORKER_TTL)
+        pipe.execute()
+
+    def recover(self, worker: str) -> int:
+        """Requeue ``worker``'s own leftovers and those of dead workers."""
+        moved = 0
+        for raw in self._redis.smembers(f'{self._key}:workers'):
+            other = raw.decode()
+            if other != worker and self._redis.exists(self._alive(other)):
+                continue
+            moved += self._restore(keys=[self._key, self._processing(other)])
+            self._redis.srem(f'{self._key}:workers', other)
+        return moved
+
+    def __len__(self) -> int:
+        return self._redis.llen(self._key)
+
+
+_queues: dict[str, LocalQueue | RedisQueue] = {}
+_queue_lock = threading.Lock()
+
+
+def get_queue(key: str = QUEUE_KEY) -> LocalQueue | RedisQueue:
+    with _queue_lock:
+        if key not in _queues:
+            cache = settings.CACHES['default']
+            if cache['BACKEND'].startswith('django_redis.'):
+                prefix = cache.get('KEY_PREFIX')
+                _queues[key] = RedisQueue(f'{prefix}:{key}' if prefix else key)
+            else:
+                _queues[key] = LocalQueue()
+        return _queues[key]
+
+
+def enqueue(provider_id: str, events: list) -> None:
+    get_queue().push(dumps({
+        'provider': provider_id,
+        'events': events,
+        'received_at': datetime.utcnow().isoformat(),
+    }))
+
+
+def claim_batches(max_items: int, worker: str) -> list[dict]:
+    """Up to ``max_items`` queued deliveries, oldest first. They stay in the
+    worker's processing list until ``ack``: a worker that dies before then
+    gets them requeued by the next ``recover``."""
+    return [loads(item) for item in get_queue().claim(max_items, worker)]
+
+
+def ack(worker: str) -> None:
+    """Forget the deliveries ``worker`` claimed: they were applied, retried
+    or dead-lettered."""
+    get_queue().ack(worker)
+
+
+def heartbeat(worker: str) -> None:
+    get_queue().heartbeat(worker)
+
+
+def recover(worker: str) -> int:
+    """Requeue deliveries claimed by dead workers (and by a previous run of
+    ``worker``). Returns how many were requeued."""
+    return get_queue().recover(worker)
+
+
+def retry_or_dead_letter(batches: list[dict]) -> int:
+    """Count a failed attempt on each delivery. Requeue it at the tail, or
+    dead-letter it once it has failed BANK_WEBHOOK_MAX_ATTEMPTS times.
+    Returns how many were dead-lettered."""
+    dead = 0
+    for batch in batches:
+        batch['attempts'] = batch.get('attempts', 0) + 1
+        if batch['attempts'] >= settings.BANK_WEBHOOK_MAX_ATTEMPTS:
+            get_queue(DEAD_LETTER_KEY).push(dumps(batch))
+            dead += 1
+        else:
+            get_queue().push(dumps(batch))
+    return dead
+
+
+def requeue_dead_letters(worker: str) -> int:
+    """Move every dead-lettered delivery back to the queue (attempts reset)."""
+    dead = get_queue(DEAD_LETTER_KEY)
+    moved = 0
+    while True:
+        items = dead.claim(500, worker)
+        if not items:
+            return moved
+        for item in items:
+            batch = loads(item)
+            batch.pop('attempts', None)
+            get_queue().push(dumps(batch))
+        dead.ack(worker)
+        moved += len(items)